@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the ClawdBot Publisher webhook receiver.
+
+Usage:
+    gunicorn -c gunicorn.conf.py webhook_receiver:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5000')}"
+
+# One threaded worker; concurrent Slack button clicks are handled by its
+# threads. The Slack send throttle and outbox (slack_approval) and the
+# signature replay cache (webhook_receiver) live in process memory, so
+# each extra worker adds another 1 msg/s to the channel and accepts a
+# replay that a sibling already saw. Scale with GUNICORN_THREADS instead.
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Handlers answer well inside Slack's 3s window; this only reaps stuck workers
+timeout = 30
+graceful_timeout = 30
+
+accesslog = "-"
+errorlog = "-"
@@ -10,22 +10,28 @@ Usage:
     send_approval_request("/data/drafts/2026-01-15_abc123.json")
 """
 
-import json
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Optional
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+try:
+    from _jsonio import loads
+except ImportError:  # imported as publisher.slack_approval (pipeline harness)
+    from publisher._jsonio import loads
+
 # ── Logging ──────────────────────────────────────────
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [SLACK] %(levelname)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+# Handlers are configured by the host process (webhook_receiver, the test
+# harness) or by the CLI entry point below — not on import.
 log = logging.getLogger("slack_approval")
 
 # ── Configuration ────────────────────────────────────
@@ -34,25 +40,236 @@ SLACK_CHANNEL = os.getenv("SLACK_APPROVAL_CHANNEL", "#clawdbot-approvals")
 
 client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
 
+# ── Rate Limiting ────────────────────────────────────
+# Slack allows ~1 message/sec per channel; pace sends slightly below that.
+# The pacing is per process, so it only holds with gunicorn's single worker
+# (see gunicorn.conf.py).
+SLACK_MIN_INTERVAL = 1.05
+SLACK_MAX_RETRIES = 3
+_slack_lock = threading.Lock()
+_last_post_ts = 0.0
+
+
+def _throttle():
+    """Block until at least SLACK_MIN_INTERVAL has passed since the last send."""
+    global _last_post_ts
+    with _slack_lock:
+        wait = SLACK_MIN_INTERVAL - (time.monotonic() - _last_post_ts)
+        if wait > 0:
+            time.sleep(wait)
+        _last_post_ts = time.monotonic()
+
+
+def _call_with_retry(method: str, **kwargs):
+    """
+    Call a WebClient method, retrying on rate limits and Slack-side 5xx errors.
+
+    Rate-limited calls wait for the Retry-After header; 5xx responses back
+    off exponentially. Any other error — or the last failed attempt — is
+    re-raised for the caller to handle.
+    """
+    for attempt in range(SLACK_MAX_RETRIES + 1):
+        _throttle()
+        try:
+            return getattr(client, method)(**kwargs)
+        except SlackApiError as e:
+            if attempt == SLACK_MAX_RETRIES:
+                raise
+            if e.response.get("error") == "ratelimited":
+                delay = int(e.response.headers.get("Retry-After", "1"))
+                log.warning(f"Slack rate limited — retrying in {delay}s")
+            elif e.response.status_code >= 500:
+                delay = 2 ** attempt
+                log.warning(f"Slack returned {e.response.status_code} — retrying in {delay}s")
+            else:
+                raise
+            time.sleep(delay)
+
+
+# ── Outbox ───────────────────────────────────────────
+# All sends go through one queue drained by a single worker thread, so
+# concurrent callers are serialized and paced instead of racing Slack's
+# rate limit. Each queued item carries a Future that resolves to the
+# Slack response (or the final SlackApiError).
+_outbox: "queue.Queue[tuple[str, dict, Future]]" = queue.Queue()
+_outbox_worker: Optional[threading.Thread] = None
+_outbox_lock = threading.Lock()
 
-def send_approval_request(draft_file: str | Path) -> Optional[str]:
+
+def _drain_outbox():
+    """Worker loop: send queued messages one at a time."""
+    while True:
+        method, kwargs, future = _outbox.get()
+        try:
+            future.set_result(_call_with_retry(method, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            _outbox.task_done()
+
+
+@atexit.register
+def _flush_outbox():
+    """
+    Deliver queued messages before the process exits.
+
+    The worker is a daemon thread, so anything still queued at shutdown
+    would otherwise be dropped. Fallback replies queued from done-callbacks
+    are included, since they are enqueued before their parent's task_done.
+    A process whose worker never started (or died with a fork) has nothing
+    to wait for.
+    """
+    if _outbox_worker is not None and _outbox_worker.is_alive():
+        _outbox.join()
+
+
+def _enqueue(method: str, **kwargs) -> Future:
+    """Queue a WebClient call and return a Future for its response."""
+    global _outbox_worker
+    # Started on first use rather than at import so forking servers
+    # (gunicorn) get a live worker in each child process.
+    with _outbox_lock:
+        if _outbox_worker is None or not _outbox_worker.is_alive():
+            _outbox_worker = threading.Thread(
+                target=_drain_outbox, name="slack-outbox", daemon=True
+            )
+            _outbox_worker.start()
+
+    future: Future = Future()
+    _outbox.put((method, kwargs, future))
+    return future
+
+
+def _slack_error(exc: BaseException) -> str:
+    """Best-effort error code from a failed Slack send."""
+    if isinstance(exc, SlackApiError):
+        return exc.response["error"]
+    return str(exc)
+
+
+# ── Block Kit Skeleton ───────────────────────────────
+# Static parts of the approval message, built once at import. Only the
+# draft-specific fields are filled in per request.
+_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "📝 New ClawdBot Draft Ready for Review",
+    },
+}
+_DIVIDER_BLOCK = {"type": "divider"}
+_APPROVE_CONFIRM = {
+    "title": {"type": "plain_text", "text": "Confirm Approval"},
+    "text": {
+        "type": "plain_text",
+        "text": "This will post the draft to Twitter and LinkedIn. Are you sure?",
+    },
+    "confirm": {"type": "plain_text", "text": "Yes, Post It"},
+    "deny": {"type": "plain_text", "text": "Wait, Let Me Review"},
+}
+_APPROVE_TEXT = {"type": "plain_text", "text": "✅ Approve & Post"}
+_REJECT_TEXT = {"type": "plain_text", "text": "❌ Reject"}
+_EDIT_TEXT = {"type": "plain_text", "text": "✏️ Edit & Approve"}
+
+
+def _build_approval_blocks(
+    display_text: str,
+    news_source: str,
+    created_at: str,
+    word_count,
+    model: str,
+    attempt,
+    draft_name: str,
+) -> list[dict]:
+    """Assemble the approval message blocks around the shared static parts."""
+    return [
+        # ── Header ───────────────────────────────────
+        _HEADER_BLOCK,
+        # ── Divider ──────────────────────────────────
+        _DIVIDER_BLOCK,
+        # ── Draft Text ───────────────────────────────
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Draft Post:*\n\n{display_text}",
+            },
+        },
+        # ── Divider ──────────────────────────────────
+        _DIVIDER_BLOCK,
+        # ── Metadata ─────────────────────────────────
+        {
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"📰 *Source:* {news_source}",
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"🕐 *Generated:* {created_at}",
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"📊 *Words:* {word_count} | *Model:* {model} | *Attempt:* {attempt}",
+                },
+            ],
+        },
+        # ── Action Buttons ───────────────────────────
+        {
+            "type": "actions",
+            "block_id": "approval_actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": _APPROVE_TEXT,
+                    "style": "primary",
+                    "value": draft_name,
+                    "action_id": "approve_post",
+                    "confirm": _APPROVE_CONFIRM,
+                },
+                {
+                    "type": "button",
+                    "text": _REJECT_TEXT,
+                    "style": "danger",
+                    "value": draft_name,
+                    "action_id": "reject_post",
+                },
+                {
+                    "type": "button",
+                    "text": _EDIT_TEXT,
+                    "value": draft_name,
+                    "action_id": "edit_post",
+                },
+            ],
+        },
+    ]
+
+
+def send_approval_request(draft_file: str | Path, wait: bool = True) -> Optional[str]:
     """
     Send a draft to Slack with interactive Approve/Reject/Edit buttons.
 
     Args:
         draft_file: Path to the draft JSON file
+        wait: Block until Slack accepts the message. When False the message
+            is queued and the draft filename (the value carried by the
+            buttons) is returned as a correlation id; the real ts is logged
+            once the outbox worker sends it.
 
     Returns:
-        Message timestamp (ts) for tracking, or None on failure
+        Message timestamp (ts) for tracking, the draft filename when
+        wait=False, or None on failure
     """
     draft_path = Path(draft_file)
 
-    if not draft_path.exists():
+    try:
+        raw = draft_path.read_bytes()
+    except FileNotFoundError:
         log.error(f"Draft file not found: {draft_path}")
         return None
 
-    with open(draft_path) as f:
-        draft = json.load(f)
+    draft = loads(raw)
 
     draft_text = draft.get("text", "")
     news_source = draft.get("news_source", "N/A")
@@ -76,91 +293,21 @@ def send_approval_request(draft_file: str | Path) -> Optional[str]:
         # Truncate draft for Slack display (3000 char limit for section blocks)
         display_text = draft_text[:2800] + ("..." if len(draft_text) > 2800 else "")
 
-        response = client.chat_postMessage(
+        future = _enqueue(
+            "chat_postMessage",
             channel=SLACK_CHANNEL,
             text=f"New ClawdBot draft ready for review ({word_count} words)",
-            blocks=[
-                # ── Header ───────────────────────────
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "📝 New ClawdBot Draft Ready for Review",
-                    },
-                },
-                # ── Divider ──────────────────────────
-                {"type": "divider"},
-                # ── Draft Text ───────────────────────
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*Draft Post:*\n\n{display_text}",
-                    },
-                },
-                # ── Divider ──────────────────────────
-                {"type": "divider"},
-                # ── Metadata ─────────────────────────
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"📰 *Source:* {news_source}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"🕐 *Generated:* {created_at}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"📊 *Words:* {word_count} | *Model:* {model} | *Attempt:* {attempt}",
-                        },
-                    ],
-                },
-                # ── Action Buttons ───────────────────
-                {
-                    "type": "actions",
-                    "block_id": "approval_actions",
-                    "elements": [
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "✅ Approve & Post",
-                            },
-                            "style": "primary",
-                            "value": draft_path.name,
-                            "action_id": "approve_post",
-                            "confirm": {
-                                "title": {"type": "plain_text", "text": "Confirm Approval"},
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "This will post the draft to Twitter and LinkedIn. Are you sure?",
-                                },
-                                "confirm": {"type": "plain_text", "text": "Yes, Post It"},
-                                "deny": {"type": "plain_text", "text": "Wait, Let Me Review"},
-                            },
-                        },
-                        {
-                            "type": "button",
-                            "text": {"type": "plain_text", "text": "❌ Reject"},
-                            "style": "danger",
-                            "value": draft_path.name,
-                            "action_id": "reject_post",
-                        },
-                        {
-                            "type": "button",
-                            "text": {"type": "plain_text", "text": "✏️ Edit & Approve"},
-                            "value": draft_path.name,
-                            "action_id": "edit_post",
-                        },
-                    ],
-                },
-            ],
+            blocks=_build_approval_blocks(
+                display_text, news_source, created_at,
+                word_count, model, attempt, draft_path.name,
+            ),
         )
 
-        message_ts = response["ts"]
+        if not wait:
+            future.add_done_callback(_log_approval_sent)
+            return draft_path.name
+
+        message_ts = future.result()["ts"]
         log.info(f"✅ Approval request sent to {SLACK_CHANNEL} (ts: {message_ts})")
         return message_ts
 
@@ -169,36 +316,101 @@ def send_approval_request(draft_file: str | Path) -> Optional[str]:
         return None
 
 
+def _log_approval_sent(future: Future):
+    """Done-callback for queued approval requests."""
+    exc = future.exception()
+    if exc:
+        log.error(f"Failed to send Slack message: {_slack_error(exc)}")
+    else:
+        log.info(f"✅ Approval request sent to {SLACK_CHANNEL} (ts: {future.result()['ts']})")
+
+
+# chat_update errors that mean the original message can no longer be
+# edited; the result is posted as a thread reply instead.
+_UPDATE_FALLBACK_ERRORS = {"cant_update_message", "edit_window_closed", "message_not_found"}
+
+
+def update_message(channel: str, ts: str, text: str) -> Optional[Future]:
+    """
+    Replace an approval message (buttons included) with a line of text.
+
+    Sent as one chat_update. If Slack refuses the edit (e.g. the message is
+    outside the edit window), the text is posted as a thread reply instead.
+    Both are queued on the outbox and sent in the background.
+    """
+    if not client:
+        return None
+
+    future = _enqueue(
+        "chat_update",
+        channel=channel,
+        ts=ts,
+        text=text,
+        blocks=[{"type": "section", "text": {"type": "mrkdwn", "text": text}}],
+    )
+    future.add_done_callback(
+        lambda f: _reply_if_update_failed(f, channel, ts, text)
+    )
+    return future
+
+
 def notify_posting_result(
     channel: str,
     thread_ts: str,
     success: bool,
     platforms: list[str],
     error: str = "",
+    approved_by: str = "",
 ):
     """
-    Send a follow-up message in the approval thread with posting results.
-    """
-    if not client:
-        return
+    Report posting results by editing the original approval message.
 
+    approved_by (a Slack user ID) credits the approver in the same edit,
+    so approval and outcome cost a single chat_update.
+    """
     if success:
         text = f"✅ *Posted successfully* to: {', '.join(platforms)}"
     else:
         text = f"⚠️ *Posting failed*: {error}"
+    if approved_by:
+        text = f"*Approved* by <@{approved_by}> — {text}"
 
-    try:
-        client.chat_postMessage(
+    update_message(channel, thread_ts, text)
+
+
+def _reply_if_update_failed(future: Future, channel: str, thread_ts: str, text: str):
+    """Done-callback: fall back to a thread reply when the edit is refused."""
+    exc = future.exception()
+    if not exc:
+        return
+
+    if isinstance(exc, SlackApiError) and exc.response["error"] in _UPDATE_FALLBACK_ERRORS:
+        reply = _enqueue(
+            "chat_postMessage",
             channel=channel,
             thread_ts=thread_ts,
             text=text,
         )
-    except SlackApiError as e:
-        log.error(f"Failed to send posting result: {e.response['error']}")
+        reply.add_done_callback(_log_result_sent)
+    else:
+        log.error(f"Failed to send posting result: {_slack_error(exc)}")
+
+
+def _log_result_sent(future: Future):
+    """Done-callback for queued posting-result replies."""
+    exc = future.exception()
+    if exc:
+        log.error(f"Failed to send posting result: {_slack_error(exc)}")
 
 
 # ── CLI for Testing ──────────────────────────────────
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [SLACK] %(levelname)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
     if len(sys.argv) < 2:
         print("Usage: python slack_approval.py <draft_file_path>")
         sys.exit(1)
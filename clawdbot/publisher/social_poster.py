@@ -9,40 +9,72 @@ Supported platforms:
     - LinkedIn (via Marketing API REST)
 """
 
-import json
 import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-import tweepy
-import requests
+try:
+    from _jsonio import format_json, read_json
+except ImportError:  # imported as publisher.social_poster (pipeline harness)
+    from publisher._jsonio import format_json, read_json
+
+# tweepy and requests are imported lazily inside the functions that need
+# them, so importing this module for one platform doesn't load the other's
+# HTTP stack.
+if TYPE_CHECKING:
+    import tweepy
+    import requests
 
 # ── Logging ──────────────────────────────────────────
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [POSTER] %(levelname)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+# Handlers are configured by the host process (webhook_receiver, the test
+# harness) or by the CLI entry point below — not on import.
 log = logging.getLogger("social_poster")
 
+# ── Configuration ────────────────────────────────────
+_TWITTER_CREDS = (
+    os.getenv("TWITTER_API_KEY", ""),
+    os.getenv("TWITTER_API_SECRET", ""),
+    os.getenv("TWITTER_ACCESS_TOKEN", ""),
+    os.getenv("TWITTER_ACCESS_SECRET", ""),
+)
+_LINKEDIN_CREDS = (
+    os.getenv("LINKEDIN_ACCESS_TOKEN", ""),
+    os.getenv("LINKEDIN_ORG_ID", ""),
+)
+
+# Upper bound on how long the orchestrator waits for a single platform
+POST_TIMEOUT_SECONDS = 60
+
+# Twitter 429 handling: retry a couple of times, but never sleep past the
+# orchestrator timeout (tweepy's wait_on_rate_limit can wait 15 minutes)
+TWITTER_MAX_RETRIES = 2
+TWITTER_MAX_RATE_LIMIT_WAIT = 20
+
 
 # ═══════════════════════════════════════════════════════
 # TWITTER / X
 # ═══════════════════════════════════════════════════════
 
 
-def get_twitter_client() -> Optional[tweepy.Client]:
-    """Initialize Twitter API v2 client."""
-    api_key = os.getenv("TWITTER_API_KEY", "")
-    api_secret = os.getenv("TWITTER_API_SECRET", "")
-    access_token = os.getenv("TWITTER_ACCESS_TOKEN", "")
-    access_secret = os.getenv("TWITTER_ACCESS_SECRET", "")
+@lru_cache(maxsize=1)
+def get_twitter_client() -> Optional["tweepy.Client"]:
+    """
+    Initialize Twitter API v2 client.
 
-    if not all([api_key, api_secret, access_token, access_secret]):
+    Built once per process; later calls return the cached client (or the
+    cached None if credentials are missing).
+    """
+    if not all(_TWITTER_CREDS):
         log.warning("Twitter credentials not fully configured")
         return None
 
+    import tweepy
+
+    api_key, api_secret, access_token, access_secret = _TWITTER_CREDS
     try:
         client = tweepy.Client(
             consumer_key=api_key,
@@ -58,7 +90,10 @@ def get_twitter_client() -> Optional[tweepy.Client]:
 
 def post_to_twitter(text: str) -> Optional[str]:
     """
-    Post a tweet. Truncates to 280 chars if needed (adds ellipsis).
+    Post a tweet.
+
+    The caller is responsible for fitting ``text`` into 280 characters;
+    post_to_all_platforms() does this before calling.
 
     Returns:
         Tweet ID on success, None on failure.
@@ -68,19 +103,26 @@ def post_to_twitter(text: str) -> Optional[str]:
         log.warning("Twitter client not available — skipping")
         return None
 
-    # Twitter character limit
-    if len(text) > 280:
-        text = text[:277] + "..."
-        log.warning("Tweet truncated to 280 characters")
+    import tweepy
 
-    try:
-        response = client.create_tweet(text=text)
-        tweet_id = response.data["id"]
-        log.info(f"✅ Posted to Twitter: https://twitter.com/i/status/{tweet_id}")
-        return tweet_id
-    except tweepy.TweepyException as e:
-        log.error(f"❌ Twitter posting failed: {e}")
-        return None
+    for attempt in range(TWITTER_MAX_RETRIES + 1):
+        try:
+            response = client.create_tweet(text=text)
+            tweet_id = response.data["id"]
+            log.info(f"✅ Posted to Twitter: https://twitter.com/i/status/{tweet_id}")
+            return tweet_id
+        except tweepy.TooManyRequests as e:
+            reset = e.response.headers.get("x-rate-limit-reset")
+            wait = int(reset) - time.time() if reset else TWITTER_MAX_RATE_LIMIT_WAIT
+            if attempt == TWITTER_MAX_RETRIES or wait > TWITTER_MAX_RATE_LIMIT_WAIT:
+                log.error(f"❌ Twitter rate limited (resets in {wait:.0f}s): {e}")
+                return None
+            wait = max(wait, 1)
+            log.warning(f"Twitter rate limited — retrying in {wait:.0f}s")
+            time.sleep(wait)
+        except tweepy.TweepyException as e:
+            log.error(f"❌ Twitter posting failed: {e}")
+            return None
 
 
 # ═══════════════════════════════════════════════════════
@@ -88,6 +130,69 @@ def post_to_twitter(text: str) -> Optional[str]:
 # ═══════════════════════════════════════════════════════
 
 
+LINKEDIN_UGC_URL = "https://api.linkedin.com/v2/ugcPosts"
+
+# Static parts of every UGC post, built once per process
+_LI_HEADERS_STATIC = {
+    "Content-Type": "application/json",
+    "X-Restli-Protocol-Version": "2.0.0",
+}
+_LI_VISIBILITY = {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
+
+
+def _linkedin_payload(author: str, text: str) -> dict:
+    """Build a UGC post body around the shared static parts."""
+    return {
+        "author": author,
+        "lifecycleState": "PUBLISHED",
+        "specificContent": {
+            "com.linkedin.ugc.ShareContent": {
+                "shareCommentary": {"text": text},
+                "shareMediaCategory": "NONE",
+            }
+        },
+        "visibility": _LI_VISIBILITY,
+    }
+
+
+@lru_cache(maxsize=1)
+def _linkedin_session() -> "requests.Session":
+    """
+    Shared LinkedIn session: keeps the HTTPS connection alive between posts
+    and backs off on 429 (honouring Retry-After) and connection errors.
+    Carries the static and auth headers so each post sends only its body.
+
+    POST isn't idempotent: a 5xx or a dropped response may follow a post
+    that LinkedIn already published, so only failures that guarantee
+    nothing was created are retried.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update(_LI_HEADERS_STATIC)
+    session.headers["Authorization"] = f"Bearer {_LINKEDIN_CREDS[0]}"
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=[429],
+                allowed_methods=frozenset({"POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
 def post_to_linkedin(text: str) -> Optional[str]:
     """
     Post to LinkedIn organization page via Marketing API.
@@ -99,38 +204,20 @@ def post_to_linkedin(text: str) -> Optional[str]:
     Returns:
         Post URN on success, None on failure.
     """
-    access_token = os.getenv("LINKEDIN_ACCESS_TOKEN", "")
-    org_id = os.getenv("LINKEDIN_ORG_ID", "")
+    access_token, org_id = _LINKEDIN_CREDS
 
     if not access_token or not org_id:
         log.warning("LinkedIn credentials not configured — skipping")
         return None
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0",
-    }
+    import requests
 
     # LinkedIn UGC Post API
-    payload = {
-        "author": f"urn:li:organization:{org_id}",
-        "lifecycleState": "PUBLISHED",
-        "specificContent": {
-            "com.linkedin.ugc.ShareContent": {
-                "shareCommentary": {"text": text},
-                "shareMediaCategory": "NONE",
-            }
-        },
-        "visibility": {
-            "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
-        },
-    }
+    payload = _linkedin_payload(f"urn:li:organization:{org_id}", text)
 
     try:
-        response = requests.post(
-            "https://api.linkedin.com/v2/ugcPosts",
-            headers=headers,
+        response = _linkedin_session().post(
+            LINKEDIN_UGC_URL,
             json=payload,
             timeout=15,
         )
@@ -173,49 +260,70 @@ def post_to_all_platforms(draft: dict, skip_platforms: list = None) -> dict:
     if skip_platforms:
         log.info(f"Skipping: {', '.join(skip_platforms)}")
     results = {}
+    futures = {}
 
-    # ── Twitter ──────────────────────────────────────
-    if "twitter" in skip_platforms:
-        results["twitter"] = {"success": False, "skipped": True}
-        log.info("⏭️  Twitter: skipped")
-    else:
-        try:
-            # For Twitter, we might want a shorter version
-            twitter_text = text
-            if len(text) > 280:
-                # Try to find a natural break point
-                sentences = text.split(". ")
-                twitter_text = sentences[0] + "."
-                for s in sentences[1:]:
-                    if len(twitter_text + " " + s + ".") <= 275:
-                        twitter_text += " " + s + "."
-                    else:
-                        break
-                if len(twitter_text) > 280:
-                    twitter_text = text[:277] + "..."
-
-            tweet_id = post_to_twitter(twitter_text)
-            results["twitter"] = {
-                "success": bool(tweet_id),
-                "post_id": tweet_id,
-                "url": f"https://twitter.com/i/status/{tweet_id}" if tweet_id else None,
-            }
-        except Exception as e:
-            results["twitter"] = {"success": False, "error": str(e)}
+    # Not a context manager: its __exit__ would wait for a hung worker
+    # and defeat the timeout below. Stuck requests finish (or hit their
+    # own HTTP timeout) in the background.
+    executor = ThreadPoolExecutor(max_workers=2)
 
-    # ── LinkedIn ─────────────────────────────────────
+    # ── LinkedIn ─────────────────────────────────
+    # Submitted first so the request is in flight while the Twitter
+    # text is prepared below.
     if "linkedin" in skip_platforms:
         results["linkedin"] = {"success": False, "skipped": True}
         log.info("⏭️  LinkedIn: skipped")
     else:
-        try:
-            linkedin_id = post_to_linkedin(text)
-            results["linkedin"] = {
-                "success": bool(linkedin_id),
-                "post_id": linkedin_id,
+        futures["linkedin"] = executor.submit(post_to_linkedin, text)
+
+    # ── Twitter ──────────────────────────────────
+    if "twitter" in skip_platforms:
+        results["twitter"] = {"success": False, "skipped": True}
+        log.info("⏭️  Twitter: skipped")
+    else:
+        # For Twitter, we might want a shorter version
+        twitter_text = text
+        if len(text) > 280:
+            # Cut at the last sentence break that fits in 275 chars,
+            # falling back to the first break, then a hard truncate
+            cut = text.rfind(". ", 0, 276)
+            if cut == -1:
+                cut = text.find(". ")
+            if 0 <= cut < 280:
+                twitter_text = text[:cut] + "."
+            else:
+                twitter_text = text[:277] + "..."
+            log.warning("Tweet truncated to 280 characters")
+
+        futures["twitter"] = executor.submit(post_to_twitter, twitter_text)
+
+    # ── Collect ──────────────────────────────────
+    # One deadline for all platforms, not POST_TIMEOUT_SECONDS each. The
+    # pool is released without waiting, but not with cancel_futures: a
+    # post submitted just above may still be queued for a worker.
+    executor.shutdown(wait=False)
+    wait(futures.values(), timeout=POST_TIMEOUT_SECONDS)
+    for platform in ("twitter", "linkedin"):
+        future = futures.get(platform)
+        if future is None:
+            continue
+        if not future.done():
+            results[platform] = {
+                "success": False,
+                "error": f"timed out after {POST_TIMEOUT_SECONDS}s",
             }
+            continue
+        try:
+            post_id = future.result()
         except Exception as e:
-            results["linkedin"] = {"success": False, "error": str(e)}
+            results[platform] = {"success": False, "error": str(e)}
+            continue
+
+        results[platform] = {"success": bool(post_id), "post_id": post_id}
+        if platform == "twitter":
+            results[platform]["url"] = (
+                f"https://twitter.com/i/status/{post_id}" if post_id else None
+            )
 
     # ── Summary ──────────────────────────────────────
     successes = [p for p, r in results.items() if r.get("success")]
@@ -231,6 +339,12 @@ def post_to_all_platforms(draft: dict, skip_platforms: list = None) -> dict:
 
 # ── CLI for Testing ──────────────────────────────────
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [POSTER] %(levelname)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
     import sys
 
     if len(sys.argv) < 2:
@@ -241,9 +355,8 @@ if __name__ == "__main__":
     if sys.argv[1] == "--test":
         text = sys.argv[2] if len(sys.argv) > 2 else "ClawdBot test post 🤖"
         results = post_to_all_platforms({"text": text})
-        print(json.dumps(results, indent=2))
+        print(format_json(results))
     else:
-        with open(sys.argv[1]) as f:
-            draft = json.load(f)
+        draft = read_json(sys.argv[1])
         results = post_to_all_platforms(draft)
-        print(json.dumps(results, indent=2))
+        print(format_json(results))
@@ -19,19 +19,45 @@ Security:
 
 import json
 import os
-import sys
+import re
 import hmac
 import hashlib
-import shutil
+import ssl
 import logging
+import threading
 import time
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl
 
+import requests
 from flask import Flask, request, jsonify, abort
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import (
+    ConnectionErrorRetryHandler,
+    RateLimitErrorRetryHandler,
+    ServerErrorRetryHandler,
+)
+
+try:
+    from _jsonio import dumps, loads, read_json, write_json
+except ImportError:  # imported as publisher.webhook_receiver (pipeline harness)
+    from publisher._jsonio import dumps, loads, read_json, write_json
+
+try:
+    from social_poster import post_to_all_platforms
+except ImportError:
+    post_to_all_platforms = None
+
+try:
+    from slack_approval import notify_posting_result, update_message
+except ImportError:
+    notify_posting_result = update_message = None
 
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
@@ -44,6 +70,10 @@ log = logging.getLogger("publisher")
 # ── Configuration ────────────────────────────────────
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "")
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET", "")
+_SIGNING_SECRET_BYTES = SLACK_SIGNING_SECRET.encode() if SLACK_SIGNING_SECRET else b""
+# Keyed HMAC with the ipad/opad blocks already absorbed; each request
+# copies it instead of re-deriving the key state
+_SIGNING_HMAC = hmac.new(_SIGNING_SECRET_BYTES, digestmod=hashlib.sha256)
 SLACK_APPROVAL_CHANNEL = os.getenv("SLACK_APPROVAL_CHANNEL", "#clawdbot-approvals")
 FLASK_PORT = int(os.getenv("FLASK_PORT", "5000"))
 
@@ -55,12 +85,64 @@ APPROVED_PATH = Path(os.getenv("APPROVED_PATH", "/data/approved"))
 DRAFTS_PATH.mkdir(parents=True, exist_ok=True)
 APPROVED_PATH.mkdir(parents=True, exist_ok=True)
 
-# Initialize Slack client
-slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+# Initialize Slack client. WebClient talks to Slack through urllib, which
+# has no keep-alive session to inject, and builds a fresh SSL context (CA
+# bundle load included) for every connection unless one is passed in.
+# Share one context, and let the SDK retry transient failures itself.
+_slack_ssl = ssl.create_default_context()
+slack_client = (
+    WebClient(
+        token=SLACK_BOT_TOKEN,
+        ssl=_slack_ssl,
+        retry_handlers=[
+            ConnectionErrorRetryHandler(),
+            RateLimitErrorRetryHandler(max_retry_count=2),
+            ServerErrorRetryHandler(max_retry_count=2),
+        ],
+    )
+    if SLACK_BOT_TOKEN
+    else None
+)
+
+# Approve/reject/post work runs off the request thread so Slack gets its
+# acknowledgement within the 3-second interactive timeout
+ACTION_WORKERS = int(os.getenv("ACTION_WORKERS", "4"))
+action_pool = ThreadPoolExecutor(max_workers=ACTION_WORKERS, thread_name_prefix="action")
 
 # ── Flask App ────────────────────────────────────────
 app = Flask(__name__)
 
+# Slack interaction payloads are a few KB; refuse anything larger before
+# the body is buffered
+MAX_BODY_SIZE = 64 * 1024
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_SIZE
+
+# ── Replay Protection ────────────────────────────────
+# Slack signatures are only accepted within this window, and each one
+# only once. The seen-set is per process, which is why gunicorn.conf.py
+# runs a single worker; with several it narrows rather than closes the
+# replay window.
+REPLAY_WINDOW_SECONDS = 300
+_recent_sigs: "OrderedDict[str, float]" = OrderedDict()
+_recent_sigs_lock = threading.Lock()
+
+
+def _seen_signature(signature: str) -> bool:
+    """Record a verified signature; True if it was already used in the window."""
+    now = time.monotonic()
+    with _recent_sigs_lock:
+        # Oldest first, so evict from the front until inside the window
+        while _recent_sigs:
+            oldest, seen_at = next(iter(_recent_sigs.items()))
+            if now - seen_at <= REPLAY_WINDOW_SECONDS:
+                break
+            del _recent_sigs[oldest]
+
+        if signature in _recent_sigs:
+            return True
+        _recent_sigs[signature] = now
+        return False
+
 
 def verify_slack_signature(req) -> bool:
     """
@@ -82,25 +164,166 @@ def verify_slack_signature(req) -> bool:
 
     # Reject requests older than 5 minutes (replay attack protection)
     try:
-        if abs(time.time() - int(timestamp)) > 300:
+        if abs(time.time() - int(timestamp)) > REPLAY_WINDOW_SECONDS:
             log.warning("Request timestamp too old — possible replay attack")
             return False
     except ValueError:
         return False
 
-    # Compute expected signature
-    body = req.get_data(as_text=True)
-    sig_basestring = f"v0:{timestamp}:{body}"
-    expected_sig = (
-        "v0="
-        + hmac.new(
-            SLACK_SIGNING_SECRET.encode(),
-            sig_basestring.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-    )
+    # Compute expected signature over the raw body bytes; get_data() caches
+    # them for the payload parsing that follows
+    sig_basestring = b"v0:" + timestamp.encode() + b":" + req.get_data()
+    # OpenSSL-backed HMAC, using the CPU's SHA extensions where available
+    mac = _SIGNING_HMAC.copy()
+    mac.update(sig_basestring)
+    expected_sig = "v0=" + mac.hexdigest()
+
+    if not hmac.compare_digest(expected_sig, signature):
+        return False
+
+    if _seen_signature(signature):
+        log.warning("Slack signature already used — possible replay attack")
+        return False
+
+    return True
+
+
+def _form_field(req, name: str) -> Optional[str]:
+    """
+    Pull one field out of a form-encoded body.
+
+    Reads the raw body that verify_slack_signature already cached instead of
+    having Werkzeug build the full request.form MultiDict.
+    """
+    if req.mimetype != "application/x-www-form-urlencoded":
+        return None
+    for key, value in parse_qsl(req.get_data().decode("utf-8", "replace")):
+        if key == name:
+            return value
+    return None
+
+
+# (epoch second, formatted) — rebuilt at most once a second
+_now_cache: tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601, to the second, cached per second."""
+    global _now_cache
+    now = int(time.time())
+    if _now_cache[0] != now:
+        stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _now_cache = (now, stamp)
+    return _now_cache[1]
+
+
+# Counts words like str.split() without building the list
+_WORD_RE = re.compile(r"\S+")
+
+
+# ── Draft Index ──────────────────────────────────────
+# /health and /drafts are served from memory. The index tracks each
+# directory's mtime and only re-scans (re-parsing just the files whose own
+# mtime moved) when it changes, so drafts dropped in by the Writer or
+# moved by another gunicorn worker are still picked up.
+_index_lock = threading.RLock()
+_draft_index: dict[str, dict] = {}   # filename → summary (parseable drafts)
+_draft_mtimes: dict[str, int] = {}   # filename → st_mtime_ns (all *.json)
+_drafts_dir_mtime: Optional[int] = None
+_approved_count = 0
+_approved_dir_mtime: Optional[int] = None
 
-    return hmac.compare_digest(expected_sig, signature)
+
+def _draft_summary(filename: str, draft: dict) -> dict:
+    """The subset of a draft served by /drafts (never the full text)."""
+    return {
+        "filename": filename,
+        "status": draft.get("status", "unknown"),
+        "created_at": draft.get("created_at", ""),
+        "word_count": draft.get("word_count", 0),
+        "preview": draft.get("text", "")[:100] + "...",
+    }
+
+
+def _json_entries(directory: Path) -> list[os.DirEntry]:
+    """
+    *.json files in a directory, as scandir entries.
+
+    Matches Path.glob("*.json") (hidden files skipped) without building a
+    Path per file; the entries' stat() results are cached on the entry.
+    """
+    with os.scandir(directory) as it:
+        return [
+            e for e in it
+            if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()
+        ]
+
+
+def _refresh_draft_index():
+    """Re-sync the drafts index with DRAFTS_PATH if the directory changed."""
+    global _drafts_dir_mtime
+    dir_mtime = DRAFTS_PATH.stat().st_mtime_ns
+
+    with _index_lock:
+        if dir_mtime == _drafts_dir_mtime:
+            return
+
+        seen = set()
+        for entry in _json_entries(DRAFTS_PATH):
+            try:
+                mtime = entry.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            seen.add(entry.name)
+            if _draft_mtimes.get(entry.name) == mtime:
+                continue
+
+            _draft_mtimes[entry.name] = mtime
+            try:
+                _draft_index[entry.name] = _draft_summary(entry.name, read_json(Path(entry.path)))
+            except Exception:
+                _draft_index.pop(entry.name, None)
+
+        for name in _draft_mtimes.keys() - seen:
+            _draft_mtimes.pop(name, None)
+            _draft_index.pop(name, None)
+
+        _drafts_dir_mtime = dir_mtime
+
+
+def _index_put(path: Path, draft: dict):
+    """Record a draft this process just wrote."""
+    with _index_lock:
+        _draft_mtimes[path.name] = path.stat().st_mtime_ns
+        _draft_index[path.name] = _draft_summary(path.name, draft)
+
+
+def _index_drop(filename: str):
+    """Forget a draft this process just removed."""
+    with _index_lock:
+        _draft_mtimes.pop(filename, None)
+        _draft_index.pop(filename, None)
+
+
+def _count_approved() -> int:
+    """Number of approved drafts, re-counted only when approved/ changes."""
+    global _approved_count, _approved_dir_mtime
+    dir_mtime = APPROVED_PATH.stat().st_mtime_ns
+
+    with _index_lock:
+        if dir_mtime != _approved_dir_mtime:
+            _approved_count = len(_json_entries(APPROVED_PATH))
+            _approved_dir_mtime = dir_mtime
+        return _approved_count
+
+
+_refresh_draft_index()
+
+
+@lru_cache(maxsize=256)
+def _load_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Parse a draft, memoized on its mtime and size so rewrites invalidate it."""
+    return read_json(Path(path_str))
 
 
 def load_draft(draft_filename: str) -> Optional[dict]:
@@ -109,22 +332,24 @@ def load_draft(draft_filename: str) -> Optional[dict]:
     safe_name = Path(draft_filename).name
     draft_path = DRAFTS_PATH / safe_name
 
-    if not draft_path.exists():
+    try:
+        st = draft_path.stat()
+    except FileNotFoundError:
         log.error(f"Draft not found: {draft_path}")
         return None
 
     try:
-        with open(draft_path) as f:
-            return json.load(f)
+        # Copy so callers can't mutate the cached entry
+        return dict(_load_cached(str(draft_path), st.st_mtime_ns, st.st_size))
     except (json.JSONDecodeError, IOError) as e:
         log.error(f"Failed to load draft {safe_name}: {e}")
         return None
 
 
-def approve_draft(draft_filename: str, approver: str) -> Optional[Path]:
+def approve_draft(draft_filename: str, approver: str) -> Optional[Tuple[Path, dict]]:
     """
     Move a draft from drafts/ to approved/ and update its status.
-    Returns the path to the approved file.
+    Returns the path to the approved file and the updated draft.
     """
     safe_name = Path(draft_filename).name
     source = DRAFTS_PATH / safe_name
@@ -136,21 +361,21 @@ def approve_draft(draft_filename: str, approver: str) -> Optional[Path]:
 
     try:
         # Load, update status, write to approved/
-        with open(source) as f:
-            draft = json.load(f)
+        draft = read_json(source)
 
         draft["status"] = "approved"
-        draft["approved_at"] = datetime.utcnow().isoformat()
+        draft["approved_at"] = _now_iso()
         draft["approved_by"] = approver
 
-        with open(destination, "w") as f:
-            json.dump(draft, f, indent=2)
+        # Compact: drafts past this point are only read back by code
+        write_json(destination, draft, indent=False)
 
         # Remove from drafts/
         source.unlink()
+        _index_drop(safe_name)
 
         log.info(f"✅ Draft approved: {safe_name} by {approver}")
-        return destination
+        return destination, draft
 
     except Exception as e:
         log.error(f"Failed to approve draft: {e}")
@@ -167,21 +392,21 @@ def reject_draft(draft_filename: str, rejector: str, reason: str = "") -> bool:
         return False
 
     try:
-        with open(source) as f:
-            draft = json.load(f)
+        draft = read_json(source)
 
         draft["status"] = "rejected"
-        draft["rejected_at"] = datetime.utcnow().isoformat()
+        draft["rejected_at"] = _now_iso()
         draft["rejected_by"] = rejector
         draft["rejection_reason"] = reason
 
         # Write back (keep in drafts/ for audit)
-        rejected_name = f"REJECTED_{safe_name}"
-        with open(DRAFTS_PATH / rejected_name, "w") as f:
-            json.dump(draft, f, indent=2)
+        rejected_path = DRAFTS_PATH / f"REJECTED_{safe_name}"
+        write_json(rejected_path, draft, indent=False)
+        _index_put(rejected_path, draft)
 
         # Remove original
         source.unlink()
+        _index_drop(safe_name)
 
         log.info(f"❌ Draft rejected: {safe_name} by {rejector}")
         return True
@@ -201,20 +426,19 @@ def edit_draft(draft_filename: str, new_text: str, editor: str) -> bool:
         return False
 
     try:
-        with open(draft_path) as f:
-            draft = json.load(f)
+        draft = read_json(draft_path)
 
         # Preserve original text for audit
         if "original_text" not in draft:
             draft["original_text"] = draft["text"]
 
         draft["text"] = new_text
-        draft["edited_at"] = datetime.utcnow().isoformat()
+        draft["edited_at"] = _now_iso()
         draft["edited_by"] = editor
-        draft["word_count"] = len(new_text.split())
+        draft["word_count"] = sum(1 for _ in _WORD_RE.finditer(new_text))
 
-        with open(draft_path, "w") as f:
-            json.dump(draft, f, indent=2)
+        write_json(draft_path, draft, indent=False)
+        _index_put(draft_path, draft)
 
         log.info(f"✏️ Draft edited: {safe_name} by {editor}")
         return True
@@ -225,11 +449,20 @@ def edit_draft(draft_filename: str, new_text: str, editor: str) -> bool:
 
 
 def update_slack_message(channel: str, ts: str, text: str, status_emoji: str):
-    """Update the original Slack approval message with result."""
+    """
+    Update the original Slack approval message with result.
+
+    Goes through slack_approval's paced outbox (with its thread-reply
+    fallback) when that module is available.
+    """
     if not slack_client:
         log.warning("Slack client not initialized — skipping message update")
         return
 
+    if update_message:
+        update_message(channel, ts, f"{status_emoji} {text}")
+        return
+
     try:
         slack_client.chat_update(
             channel=channel,
@@ -246,6 +479,131 @@ def update_slack_message(channel: str, ts: str, text: str, status_emoji: str):
         log.error(f"Failed to update Slack message: {e.response['error']}")
 
 
+def respond_to_slack(response_url: str, text: str):
+    """Send a follow-up to the user via the interaction's response_url."""
+    if not response_url:
+        log.info(f"No response_url — not sending: {text}")
+        return
+
+    try:
+        requests.post(
+            response_url,
+            json={"text": text, "response_type": "ephemeral", "replace_original": False},
+            timeout=10,
+        )
+    except requests.RequestException as e:
+        log.error(f"Failed to send Slack response: {e}")
+
+
+def post_approved_draft(approved_path: Path, draft: dict) -> Optional[dict]:
+    """
+    Post an approved draft to social platforms.
+
+    Returns post_to_all_platforms' results, or None if nothing was posted.
+    """
+    if not post_to_all_platforms:
+        log.info("social_poster not available — draft approved but not posted")
+        return None
+
+    try:
+        return post_to_all_platforms(draft)
+    except Exception as e:
+        log.error(f"Posting failed for {approved_path.name}: {e}")
+        return {"error": str(e)}
+
+
+def _posting_outcome(results: dict) -> Tuple[bool, list, str]:
+    """Reduce post_to_all_platforms results to (success, platforms, error)."""
+    if isinstance(results.get("error"), str):
+        return False, [], results["error"]
+
+    posted = [p for p, r in results.items() if r.get("success")]
+    failed = [
+        f"{p} ({r.get('error') or 'no post ID'})"
+        for p, r in results.items()
+        if not r.get("success") and not r.get("skipped")
+    ]
+    return bool(posted) and not failed, posted, ", ".join(failed)
+
+
+def _report_posting(channel: str, message_ts: str, results: Optional[dict], user_id: str, verb: str):
+    """
+    Edit the approval message with the approver and posting outcome.
+
+    Falls back to a plain "<verb> by" line when nothing was posted or
+    slack_approval isn't available.
+    """
+    if results is not None and notify_posting_result and slack_client:
+        # Approval and outcome land in the same chat_update
+        success, platforms, error = _posting_outcome(results)
+        notify_posting_result(
+            channel, message_ts, success, platforms, error, approved_by=user_id
+        )
+    else:
+        update_slack_message(
+            channel, message_ts,
+            f"*{verb}* by <@{user_id}> ✅",
+            "✅"
+        )
+
+
+def process_block_action(
+    action_id: str,
+    draft_filename: str,
+    approver: str,
+    user_id: str,
+    channel: str,
+    message_ts: str,
+    response_url: str,
+):
+    """Carry out an approve/reject button click. Runs on action_pool."""
+    if action_id == "approve_post":
+        approved = approve_draft(draft_filename, approver)
+        if not approved:
+            respond_to_slack(response_url, "❌ Failed to approve draft.")
+            return
+
+        results = post_approved_draft(*approved)
+        _report_posting(channel, message_ts, results, user_id, "Approved & posted")
+
+    elif action_id == "reject_post":
+        if not reject_draft(draft_filename, approver):
+            respond_to_slack(response_url, "❌ Failed to reject draft.")
+            return
+
+        update_slack_message(
+            channel, message_ts,
+            f"*Rejected* by <@{user_id}> ❌",
+            "❌"
+        )
+
+
+def process_edit_submission(
+    draft_filename: str,
+    new_text: str,
+    editor: str,
+    user_id: str,
+    channel: str,
+    message_ts: str,
+):
+    """
+    Save an edited draft, auto-approve it and post. Runs on action_pool.
+
+    The outcome is reported on the approval message the same way as a
+    button approval; modals opened without the message reference (before
+    it was carried in private_metadata) only log it.
+    """
+    if not edit_draft(draft_filename, new_text, editor):
+        return
+
+    approved = approve_draft(draft_filename, editor)
+    if approved:
+        results = post_approved_draft(*approved)
+        log.info(f"✅ Draft edited and approved by {editor}")
+        if channel and message_ts:
+            _report_posting(channel, message_ts, results, user_id, "Edited & approved")
+
+
 # ═══════════════════════════════════════════════════════
 # ROUTES
 # ═══════════════════════════════════════════════════════
@@ -254,14 +612,13 @@ def update_slack_message(channel: str, ts: str, text: str, status_emoji: str):
 @app.route("/health", methods=["GET"])
 def health():
     """Health check endpoint."""
-    pending = list(DRAFTS_PATH.glob("*.json"))
-    approved = list(APPROVED_PATH.glob("*.json"))
+    _refresh_draft_index()
     return jsonify(
         {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "pending_drafts": len(pending),
-            "approved_drafts": len(approved),
+            "timestamp": _now_iso(),
+            "pending_drafts": len(_draft_mtimes),
+            "approved_drafts": _count_approved(),
         }
     )
 
@@ -269,22 +626,9 @@ def health():
 @app.route("/drafts", methods=["GET"])
 def list_drafts():
     """Debug endpoint: list all pending drafts."""
-    drafts = []
-    for f in sorted(DRAFTS_PATH.glob("*.json")):
-        try:
-            with open(f) as fh:
-                data = json.load(fh)
-            drafts.append(
-                {
-                    "filename": f.name,
-                    "status": data.get("status", "unknown"),
-                    "created_at": data.get("created_at", ""),
-                    "word_count": data.get("word_count", 0),
-                    "preview": data.get("text", "")[:100] + "...",
-                }
-            )
-        except Exception:
-            continue
+    _refresh_draft_index()
+    with _index_lock:
+        drafts = [_draft_index[name] for name in sorted(_draft_index)]
     return jsonify({"drafts": drafts, "count": len(drafts)})
 
 
@@ -325,9 +669,9 @@ def slack_actions():
     # ── Parse Payload ────────────────────────────────
     try:
         # Slack sends payload as form-encoded 'payload' field
-        raw_payload = request.form.get("payload")
+        raw_payload = _form_field(request, "payload")
         if raw_payload:
-            payload = json.loads(raw_payload)
+            payload = loads(raw_payload)
         else:
             # Fallback: try JSON body (for testing)
             payload = request.get_json(force=True) or {}
@@ -361,53 +705,27 @@ def slack_actions():
         # Channel and message info for updating
         channel = payload.get("channel", {}).get("id", "")
         message_ts = payload.get("message", {}).get("ts", "")
+        response_url = payload.get("response_url", "")
 
         log.info(f"Action: {action_id} on '{draft_filename}' by {approver}")
 
-        # ── APPROVE ──────────────────────────────────
-        if action_id == "approve_post":
-            approved_path = approve_draft(draft_filename, approver)
-            if approved_path:
-                # Trigger social posting
-                try:
-                    from social_poster import post_to_all_platforms
-                    with open(approved_path) as f:
-                        draft = json.load(f)
-                    post_to_all_platforms(draft)
-                except ImportError:
-                    log.info("social_poster not available — draft approved but not posted")
-                except Exception as e:
-                    log.error(f"Posting failed: {e}")
-
-                # Update Slack message
-                update_slack_message(
-                    channel, message_ts,
-                    f"*Approved & posted* by <@{user_id}> ✅",
-                    "✅"
-                )
-                return jsonify({"text": "✅ Draft approved and posted!"})
-            else:
-                return jsonify({"text": "❌ Failed to approve draft."})
-
-        # ── REJECT ───────────────────────────────────
-        elif action_id == "reject_post":
-            if reject_draft(draft_filename, approver):
-                update_slack_message(
-                    channel, message_ts,
-                    f"*Rejected* by <@{user_id}> ❌",
-                    "❌"
-                )
-                return jsonify({"text": "❌ Draft rejected."})
-            else:
-                return jsonify({"text": "❌ Failed to reject draft."})
+        # ── APPROVE / REJECT ─────────────────────────
+        # Acknowledge now; the file moves, posting and message update
+        # happen in the background
+        if action_id in ("approve_post", "reject_post"):
+            action_pool.submit(
+                process_block_action,
+                action_id, draft_filename, approver, user_id,
+                channel, message_ts, response_url,
+            )
+            return "", 200
 
         # ── EDIT ─────────────────────────────────────
-        elif action_id == "edit_post":
+        if action_id == "edit_post":
             return open_edit_modal(payload, draft_filename)
 
-        else:
-            log.warning(f"Unknown action_id: {action_id}")
-            return jsonify({"ok": True})
+        log.warning(f"Unknown action_id: {action_id}")
+        return jsonify({"ok": True})
 
     return jsonify({"ok": True})
 
@@ -416,6 +734,9 @@ def open_edit_modal(payload: dict, draft_filename: str):
     """
     Open a Slack modal dialog for inline text editing.
     The user can modify the draft text before approving.
+
+    The draft filename and the approval message's channel and ts travel
+    in private_metadata, so the submission can report the posting result.
     """
     if not slack_client:
         return jsonify({"text": "⚠️ Slack client not configured"})
@@ -434,7 +755,11 @@ def open_edit_modal(payload: dict, draft_filename: str):
             view={
                 "type": "modal",
                 "callback_id": "edit_draft_modal",
-                "private_metadata": draft_filename,
+                "private_metadata": _dumps_metadata(
+                    draft_filename,
+                    payload.get("channel", {}).get("id", ""),
+                    payload.get("message", {}).get("ts", ""),
+                ),
                 "title": {"type": "plain_text", "text": "Edit Draft"},
                 "submit": {"type": "plain_text", "text": "Save & Approve"},
                 "close": {"type": "plain_text", "text": "Cancel"},
@@ -472,6 +797,27 @@ def open_edit_modal(payload: dict, draft_filename: str):
         return jsonify({"text": f"⚠️ Failed to open editor: {e.response['error']}"})
 
 
+def _dumps_metadata(draft_filename: str, channel: str, message_ts: str) -> str:
+    """Pack the edit modal's private_metadata."""
+    return dumps({"draft": draft_filename, "channel": channel, "ts": message_ts}, indent=False).decode()
+
+
+def _loads_metadata(metadata: str) -> Tuple[str, str, str]:
+    """
+    Unpack the edit modal's private_metadata into (draft, channel, ts).
+
+    Modals opened before the message reference was added carry the bare
+    draft filename.
+    """
+    try:
+        data = loads(metadata)
+    except ValueError:
+        return metadata, "", ""
+    if not isinstance(data, dict):
+        return metadata, "", ""
+    return data.get("draft", ""), data.get("channel", ""), data.get("ts", "")
+
+
 def handle_edit_submission(payload: dict):
     """Handle the modal submission after editing."""
     user = payload.get("user", {})
@@ -479,9 +825,9 @@ def handle_edit_submission(payload: dict):
     user_id = user.get("id", "unknown")
     editor = f"{user_name} ({user_id})"
 
-    # Extract draft filename from private_metadata
+    # Extract draft filename and approval message from private_metadata
     view = payload.get("view", {})
-    draft_filename = view.get("private_metadata", "")
+    draft_filename, channel, message_ts = _loads_metadata(view.get("private_metadata", ""))
 
     # Extract edited text from form values
     values = view.get("state", {}).get("values", {})
@@ -494,23 +840,11 @@ def handle_edit_submission(payload: dict):
             "draft_text_block": "Text cannot be empty"
         }})
 
-    # Save the edit
-    if edit_draft(draft_filename, new_text, editor):
-        # Auto-approve after edit
-        approved_path = approve_draft(draft_filename, editor)
-        if approved_path:
-            # Trigger posting
-            try:
-                from social_poster import post_to_all_platforms
-                with open(approved_path) as f:
-                    draft = json.load(f)
-                post_to_all_platforms(draft)
-            except ImportError:
-                log.info("social_poster not available")
-            except Exception as e:
-                log.error(f"Posting failed after edit: {e}")
-
-            log.info(f"✅ Draft edited and approved by {editor}")
+    # Save the edit, auto-approve and post in the background
+    action_pool.submit(
+        process_edit_submission,
+        draft_filename, new_text, editor, user_id, channel, message_ts,
+    )
 
     return jsonify({"response_action": "clear"})
 
@@ -520,6 +854,8 @@ def handle_edit_submission(payload: dict):
 # ═══════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    # Local development only — containers run this app under gunicorn
+    # (see gunicorn.conf.py)
     log.info("=" * 60)
     log.info("ClawdBot Publisher — Slack Webhook Receiver")
     log.info(f"Listening on port {FLASK_PORT}")
@@ -0,0 +1,94 @@
+"""
+ClawdBot JSON I/O — Shared JSON helpers for the Scraper, Writer and Publisher.
+
+Each container's build context holds only its own directory, so this file
+is kept as three byte-identical copies: scraper/_jsonio.py,
+writer/_jsonio.py and publisher/_jsonio.py. Edit one, copy it over the
+other two; test_harness/test_jsonio.py fails while they differ.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Files are swapped into place atomically, so readers (the
+Writer, the Publisher's draft index, the pipeline harness) never see a
+half-written file.
+
+Usage:
+    from _jsonio import read_json, write_json
+
+    draft = read_json(path)
+    write_json(path, draft)
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(raw: bytes | str):
+    """
+    Parse JSON text or bytes.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exception either way.
+    """
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def dumps(data, indent: bool = True) -> bytes:
+    """
+    Serialize data as UTF-8 JSON bytes, 2-space indented or compact.
+
+    Values JSON can't encode (e.g. datetimes) are str()'d.
+    """
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0, default=str)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def format_json(data) -> str:
+    """Pretty-print data for a terminal."""
+    return dumps(data).decode()
+
+
+def read_json(path: str | Path):
+    """Parse a JSON file in one binary read."""
+    return loads(Path(path).read_bytes())
+
+
+def write_atomic(path: str | Path, raw: bytes):
+    """
+    Replace path with raw in a single step.
+
+    The bytes go to a uniquely named temp file in the same directory, which
+    is then renamed over path, so concurrent writers never share a temp
+    file and readers only ever see a complete one.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates the file 0600
+            view = memoryview(raw)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json(path: str | Path, data, indent: bool = True):
+    """Write data as JSON (see dumps) with write_atomic."""
+    write_atomic(path, dumps(data, indent))
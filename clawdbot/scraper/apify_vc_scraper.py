@@ -13,17 +13,30 @@ Usage:
     python apify_vc_scraper.py --mode mock --output data/rag/vc_corpus.json
 """
 
-import json
 import os
 import sys
 import time
+import random
 import argparse
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from _jsonio import dumps, loads, write_atomic
+except ImportError:  # imported as scraper.apify_vc_scraper
+    from scraper._jsonio import dumps, loads, write_atomic
 
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
@@ -47,6 +60,44 @@ VC_ACCOUNTS = [
     {"handle": "andrewchen", "name": "Andrew Chen", "firm": "a16z"},
 ]
 
+# ── Apify ───────────────────────────────────────────
+APIFY_ACTOR_ID = "apify~twitter-scraper"
+# Actor runs in flight at once; keeps us well inside Apify's rate limits
+APIFY_MAX_CONCURRENCY = int(os.getenv("APIFY_MAX_CONCURRENCY", "5"))
+# Max random delay (seconds) before each run starts, so runs don't land together
+APIFY_START_JITTER = 2.0
+# Run-status polling: back off from POLL_INITIAL by 1.5x up to POLL_MAX
+# seconds, giving up on a run after RUN_TIMEOUT seconds
+APIFY_POLL_INITIAL = 1.0
+APIFY_POLL_MAX = 15.0
+APIFY_RUN_TIMEOUT = 300
+# Datasets larger than one page are fetched in parallel pages
+APIFY_PAGE_SIZE = 100
+APIFY_PAGE_WORKERS = 4
+
+# ── HTTP Session ─────────────────────────────────────
+# One pooled session shared by all scraping threads, so the run, poll and
+# dataset calls reuse connections to api.apify.com. Only idempotent GETs
+# are retried; a retried POST could start a duplicate actor run.
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ),
+    )
+    return session
+
+
+SESSION = _build_session()
+
 # ── Quality Filters ─────────────────────────────────
 # Minimum engagement for inclusion
 MIN_LIKES = 50
@@ -88,14 +139,75 @@ CATEGORY_KEYWORDS = {
 }
 
 
+# Lowercased once for the matching below; the lists above keep their
+# source casing for readability
+CATEGORY_KEYWORDS_LC = {
+    category: [kw.lower() for kw in keywords]
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+PROMO_KEYWORDS_LC = [promo.lower() for promo in PROMO_KEYWORDS]
+
+
+# ── Keyword Matching ────────────────────────────────
+# With pyahocorasick installed, every category and promo keyword goes into
+# one automaton so a tweet is scanned once instead of once per keyword.
+# Each keyword maps to (keyword, categories it scores for, is_promo).
+
+
+def _build_keyword_automaton():
+    """Build the Aho-Corasick automaton over all lowercased keywords."""
+    tags: dict[str, tuple[list[str], bool]] = {}
+    for category, keywords in CATEGORY_KEYWORDS_LC.items():
+        for kw in keywords:
+            tags.setdefault(kw, ([], False))[0].append(category)
+    for promo in PROMO_KEYWORDS_LC:
+        categories, _ = tags.get(promo, ([], False))
+        tags[promo] = (categories, True)
+
+    automaton = ahocorasick.Automaton()
+    for kw, (categories, is_promo) in tags.items():
+        automaton.add_word(kw, (kw, tuple(categories), is_promo))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+
+
+def _scan_keywords(text_lower: str, reject_promo: bool) -> Optional[dict[str, int]]:
+    """
+    Score every category against lowercased text in one pass.
+
+    A keyword scores once however often it appears, as with `in`. With
+    reject_promo, returns None as soon as a promo keyword is found.
+    """
+    scores = dict.fromkeys(CATEGORY_KEYWORDS, 0)
+    if _KEYWORD_AUTOMATON:
+        matched = set()
+        for _, match in _KEYWORD_AUTOMATON.iter(text_lower):
+            _, categories, is_promo = match
+            if is_promo and reject_promo:
+                return None
+            if match not in matched:
+                matched.add(match)
+                for category in categories:
+                    scores[category] += 1
+        return scores
+
+    if reject_promo and any(promo in text_lower for promo in PROMO_KEYWORDS_LC):
+        return None
+    for category, keywords in CATEGORY_KEYWORDS_LC.items():
+        scores[category] = sum(1 for kw in keywords if kw in text_lower)
+    return scores
+
+
 def classify_category(text: str) -> str:
     """Classify tweet into a category based on keyword matching."""
-    text_lower = text.lower()
-    scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw.lower() in text_lower)
-        scores[category] = score
+    return _best_category(_scan_keywords(text.lower(), reject_promo=False))
+
 
+def _best_category(scores: dict[str, int]) -> str:
+    """Highest-scoring category, or general_insight when nothing matched."""
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "general_insight"
 
@@ -105,111 +217,204 @@ def is_high_quality(tweet: dict) -> bool:
     Filter for high-quality VC content.
     Rejects promotional, low-engagement, and short tweets.
     """
-    text = tweet.get("text", "").lower()
-
-    # Reject promotional content
-    for promo in PROMO_KEYWORDS:
-        if promo.lower() in text:
-            return False
+    return _passes_quality(
+        tweet.get("text", ""), tweet.get("likeCount", tweet.get("favorites", 0))
+    )
 
-    # Reject very short tweets (unlikely to be insightful)
-    if len(tweet.get("text", "")) < 50:
-        return False
 
-    # Reject retweets
-    if tweet.get("text", "").startswith("RT @"):
-        return False
+def _passes_thresholds(raw: str, likes: int) -> bool:
+    """The engagement, length and retweet rules of is_high_quality."""
+    # Reject low-engagement, very short (unlikely to be insightful) tweets
+    # and retweets
+    return likes >= MIN_LIKES and len(raw) >= 50 and not raw.startswith("RT @")
 
-    # Engagement threshold
-    likes = tweet.get("likeCount", tweet.get("favorites", 0))
-    if likes < MIN_LIKES:
-        return False
 
-    return True
+def _passes_quality(raw: str, likes: int) -> bool:
+    """is_high_quality on an already-extracted tweet text and like count."""
+    # Cheapest checks run first, so most rejects never reach the keyword
+    # scan; the scan rejects promotional content
+    return (
+        _passes_thresholds(raw, likes)
+        and _scan_keywords(raw.lower(), reject_promo=True) is not None
+    )
 
 
-def scrape_via_apify(accounts: list[dict], tweets_per_account: int = 100) -> list[dict]:
+def _fetch_dataset_page(dataset_id: str, token: str, offset: int) -> tuple[list[dict], Optional[int]]:
     """
-    Scrape tweets using Apify Twitter Scraper actor.
-    Requires APIFY_API_TOKEN environment variable.
+    GET one page of dataset items.
+
+    Returns the items and the dataset's total item count from the
+    X-Apify-Pagination-Total header (None if the header is missing).
     """
-    token = os.getenv("APIFY_API_TOKEN")
-    if not token or token.startswith("your_"):
-        log.error("APIFY_API_TOKEN not set. Set it in .env or environment.")
-        sys.exit(1)
+    url = (
+        f"https://api.apify.com/v2/datasets/{dataset_id}/items?token={token}"
+        f"&format=json&offset={offset}&limit={APIFY_PAGE_SIZE}"
+    )
+    resp = SESSION.get(url, timeout=30)
+    resp.raise_for_status()
+    items = loads(resp.content)
+    total = resp.headers.get("X-Apify-Pagination-Total")
+    return items, int(total) if total is not None else None
 
-    all_tweets = []
-    actor_id = "apify~twitter-scraper"
-    base_url = f"https://api.apify.com/v2/acts/{actor_id}"
 
-    for account in accounts:
-        handle = account["handle"]
-        log.info(f"🔍 Scraping @{handle} ({account['name']})...")
+def _fetch_dataset(dataset_id: str, token: str) -> list[dict]:
+    """
+    Fetch every item in a run's dataset.
 
-        # Start the actor run
-        run_input = {
-            "handles": [handle],
-            "tweetsDesired": tweets_per_account,
-            "onlyTweets": True,  # Exclude retweets
-            "proxyConfig": {"useApifyProxy": True},
-        }
+    The first page reports the dataset's real size; any further
+    APIFY_PAGE_SIZE pages are then fetched concurrently, so download and
+    parsing of one page overlap with the others, and joined in order.
+    Without a total header, pages are read one after another until a
+    short page comes back.
+    """
+    items, total = _fetch_dataset_page(dataset_id, token, 0)
+
+    if total is None:
+        page = items
+        while len(page) == APIFY_PAGE_SIZE:
+            page, _ = _fetch_dataset_page(dataset_id, token, len(items))
+            items.extend(page)
+        return items
+
+    # Step by what the first page actually returned, in case the API
+    # capped the page below APIFY_PAGE_SIZE
+    offsets = range(len(items), total, len(items)) if items else ()
+    if not offsets:
+        return items
+    with ThreadPoolExecutor(max_workers=min(APIFY_PAGE_WORKERS, len(offsets))) as pool:
+        pages = pool.map(lambda offset: _fetch_dataset_page(dataset_id, token, offset)[0], offsets)
+        return items + [item for page in pages for item in page]
+
+
+def _scrape_account(
+    account: dict,
+    tweets_per_account: int,
+    token: str,
+    poll_initial: float,
+    poll_max: float,
+) -> list[dict]:
+    """Run the Apify actor for one account and return its tweets ([] on failure)."""
+    handle = account["handle"]
+    base_url = f"https://api.apify.com/v2/acts/{APIFY_ACTOR_ID}"
+
+    # Rate limiting: stagger run starts instead of a fixed gap between accounts
+    time.sleep(random.uniform(0, APIFY_START_JITTER))
+    log.info(f"🔍 Scraping @{handle} ({account['name']})...")
+
+    # Start the actor run
+    run_input = {
+        "handles": [handle],
+        "tweetsDesired": tweets_per_account,
+        "onlyTweets": True,  # Exclude retweets
+        "proxyConfig": {"useApifyProxy": True},
+    }
 
-        try:
-            # Trigger the run
-            run_resp = requests.post(
-                f"{base_url}/runs?token={token}",
-                json=run_input,
-                timeout=30,
+    try:
+        # Trigger the run
+        run_resp = SESSION.post(
+            f"{base_url}/runs?token={token}",
+            json=run_input,
+            timeout=30,
+        )
+        run_resp.raise_for_status()
+        run_data = run_resp.json()["data"]
+        run_id = run_data["id"]
+        log.info(f"  Started Apify run: {run_id}")
+
+        # Poll for completion with backoff (max 5 minutes per account)
+        dataset_id = None
+        delay = poll_initial
+        deadline = time.monotonic() + APIFY_RUN_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 1.5, poll_max)
+            status_resp = SESSION.get(
+                f"https://api.apify.com/v2/actor-runs/{run_id}?token={token}",
+                timeout=15,
             )
-            run_resp.raise_for_status()
-            run_data = run_resp.json()["data"]
-            run_id = run_data["id"]
-            log.info(f"  Started Apify run: {run_id}")
-
-            # Poll for completion (max 5 minutes per account)
-            dataset_id = None
-            for _ in range(60):
-                time.sleep(5)
-                status_resp = requests.get(
-                    f"https://api.apify.com/v2/actor-runs/{run_id}?token={token}",
-                    timeout=15,
-                )
-                status_data = status_resp.json()["data"]
-                status = status_data["status"]
-
-                if status == "SUCCEEDED":
-                    dataset_id = status_data["defaultDatasetId"]
-                    break
-                elif status in ("FAILED", "ABORTED", "TIMED-OUT"):
-                    log.warning(f"  Run {run_id} ended with status: {status}")
-                    break
-
-            if not dataset_id:
-                log.warning(f"  Skipping @{handle} — no dataset produced.")
-                continue
+            status_data = status_resp.json()["data"]
+            status = status_data["status"]
 
-            # Fetch results from dataset
-            dataset_resp = requests.get(
-                f"https://api.apify.com/v2/datasets/{dataset_id}/items?token={token}&format=json",
-                timeout=30,
-            )
-            dataset_resp.raise_for_status()
-            tweets = dataset_resp.json()
+            if status == "SUCCEEDED":
+                dataset_id = status_data["defaultDatasetId"]
+                break
+            elif status in ("FAILED", "ABORTED", "TIMED-OUT"):
+                log.warning(f"  Run {run_id} ended with status: {status}")
+                break
+
+        if not dataset_id:
+            log.warning(f"  Skipping @{handle} — no dataset produced.")
+            return []
+
+        tweets = _fetch_dataset(dataset_id, token)
+
+        log.info(f"  ✅ Got {len(tweets)} tweets from @{handle}")
+        return tweets
+
+    except requests.RequestException as e:
+        log.error(f"  ❌ Failed to scrape @{handle}: {e}")
+        return []
+
+
+def examine(tweet: dict) -> Optional[tuple[str, str, int]]:
+    """
+    Filter and classify a tweet in one pass.
+
+    Returns (text, category, likes) for tweets that pass is_high_quality
+    and None otherwise. Built from the same _passes_thresholds and
+    _scan_keywords helpers as is_high_quality and classify_category, but
+    fields are read once and, when the tweet has no separate full_text,
+    one keyword scan both rejects promo content and scores categories.
+    """
+    raw = tweet.get("text", "")
+    # Classified on full_text when present; quality is judged on text
+    text = tweet.get("full_text", raw)
+    likes = tweet.get("likeCount", tweet.get("favorites", 0))
 
-            for tweet in tweets:
-                tweet["_account"] = account
-            all_tweets.extend(tweets)
+    if not _passes_thresholds(raw, likes):
+        return None
+    scores = _scan_keywords(raw.lower(), reject_promo=True)
+    if scores is None:
+        return None
+    if text != raw:
+        scores = _scan_keywords(text.lower(), reject_promo=False)
+    return text, _best_category(scores), likes
+
+
+def scrape_via_apify(
+    accounts: list[dict],
+    tweets_per_account: int = 100,
+    poll_initial: float = APIFY_POLL_INITIAL,
+    poll_max: float = APIFY_POLL_MAX,
+) -> list[tuple[dict, list[dict]]]:
+    """
+    Scrape tweets using Apify Twitter Scraper actor.
+    Requires APIFY_API_TOKEN environment variable.
 
-            log.info(f"  ✅ Got {len(tweets)} tweets from @{handle}")
+    Accounts are scraped concurrently (up to APIFY_MAX_CONCURRENCY actor
+    runs at once), so total time tracks the slowest run rather than the
+    sum of all of them.
 
-            # Rate limiting: be respectful
-            time.sleep(2)
+    Returns (account, tweets) pairs in account order; the raw Apify tweet
+    dicts are left untouched.
+    """
+    token = os.getenv("APIFY_API_TOKEN")
+    if not token or token.startswith("your_"):
+        log.error("APIFY_API_TOKEN not set. Set it in .env or environment.")
+        sys.exit(1)
 
-        except requests.RequestException as e:
-            log.error(f"  ❌ Failed to scrape @{handle}: {e}")
-            continue
+    if not accounts:
+        return []
 
-    return all_tweets
+    workers = min(APIFY_MAX_CONCURRENCY, len(accounts))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apify") as pool:
+        results = pool.map(
+            lambda account: _scrape_account(
+                account, tweets_per_account, token, poll_initial, poll_max
+            ),
+            accounts,
+        )
+        return list(zip(accounts, results))
 
 
 def generate_mock_corpus() -> list[dict]:
@@ -341,41 +546,43 @@ def generate_mock_corpus() -> list[dict]:
     ]
 
 
-def build_corpus(raw_tweets: list[dict]) -> dict:
+def build_corpus(scraped: list[tuple[dict, list[dict]]]) -> dict:
     """
-    Transform raw scraped tweets into the structured corpus format
-    expected by the Writer's RAG system.
+    Transform scraped (account, tweets) pairs into the structured corpus
+    format expected by the Writer's RAG system.
     """
     examples = []
-    for tweet in raw_tweets:
-        account = tweet.get("_account", {})
-        text = tweet.get("full_text", tweet.get("text", ""))
-
-        if not is_high_quality(tweet):
-            continue
-
-        likes = tweet.get("likeCount", tweet.get("favorites", 0))
-        category = classify_category(text)
-
-        examples.append(
-            {
-                "text": text,
-                "author": account.get("handle", "unknown"),
-                "author_name": account.get("name", "Unknown"),
-                "platform": "twitter",
-                "engagement": likes,
-                "category": category,
-            }
-        )
+    categories = set()
+    for account, tweets in scraped:
+        author = account.get("handle", "unknown")
+        author_name = account.get("name", "Unknown")
+
+        for tweet in tweets:
+            res = examine(tweet)
+            if not res:
+                continue
+            text, category, likes = res
+            categories.add(category)
+
+            examples.append(
+                {
+                    "text": text,
+                    "author": author,
+                    "author_name": author_name,
+                    "platform": "twitter",
+                    "engagement": likes,
+                    "category": category,
+                }
+            )
 
     # Sort by engagement (highest first)
     examples.sort(key=lambda x: x["engagement"], reverse=True)
 
     return {
         "version": "1.0",
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "total_examples": len(examples),
-        "categories": list(set(ex["category"] for ex in examples)),
+        "categories": sorted(categories),
         "examples": examples,
     }
 
@@ -399,6 +606,18 @@ def main():
         default=100,
         help="Number of tweets to scrape per account (apify mode only)",
     )
+    parser.add_argument(
+        "--poll-initial",
+        type=float,
+        default=APIFY_POLL_INITIAL,
+        help="First run-status poll interval in seconds (apify mode only)",
+    )
+    parser.add_argument(
+        "--poll-max",
+        type=float,
+        default=APIFY_POLL_MAX,
+        help="Longest run-status poll interval in seconds (apify mode only)",
+    )
     parser.add_argument(
         "--accounts",
         nargs="+",
@@ -422,23 +641,24 @@ def main():
     log.info(f"Output: {output_path}")
 
     if args.mode == "apify":
-        raw_tweets = scrape_via_apify(accounts, args.tweets_per_account)
-        corpus = build_corpus(raw_tweets)
+        scraped = scrape_via_apify(
+            accounts, args.tweets_per_account, args.poll_initial, args.poll_max
+        )
+        corpus = build_corpus(scraped)
     else:
         log.info("Using mock corpus data for testing...")
         mock_examples = generate_mock_corpus()
         corpus = {
             "version": "1.0",
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "total_examples": len(mock_examples),
-            "categories": list(set(ex["category"] for ex in mock_examples)),
+            "categories": sorted({ex["category"] for ex in mock_examples}),
             "examples": mock_examples,
         }
 
     # Write output
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(corpus, f, indent=2)
+    write_atomic(output_path, dumps(corpus))
 
     log.info(f"✅ Corpus written: {len(corpus['examples'])} examples → {output_path}")
     log.info(f"   Categories: {corpus['categories']}")
@@ -8,21 +8,35 @@ Security: This container has NO LLM access and NO write access to
 anything except the /data volume.
 """
 
-import json
 import os
 import sys
 import time
-import hashlib
+import signal
+import threading
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from typing import Optional
 
 import yaml
 import requests
 import feedparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from _jsonio import dumps, write_atomic
+except ImportError:  # imported as scraper.scraper (tests, pipeline harness)
+    from scraper._jsonio import dumps, write_atomic
+
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -41,6 +55,33 @@ if os.getenv("CLAWDBOT_LOCAL_TEST"):
     OUTPUT_PATH = Path(os.getenv("OUTPUT_PATH", "data/news/latest.json"))
 
 
+# ── HTTP Session ─────────────────────────────────────
+# One pooled session for NewsAPI and every RSS host, so repeat scrapes
+# reuse TCP/TLS connections instead of opening one per request. Idempotent
+# GETs are retried on 429/5xx with backoff.
+RSS_TIMEOUT = 15
+RSS_MAX_WORKERS = 8
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+
 def load_config() -> dict:
     """Load scraper configuration from YAML."""
     if not CONFIG_PATH.exists():
@@ -79,7 +120,7 @@ def fetch_newsapi(config: dict) -> list[dict]:
         params["domains"] = domains
 
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             api_config.get("base_url", "https://newsapi.org/v2/everything"),
             params=params,
             timeout=15,
@@ -107,83 +148,175 @@ def fetch_newsapi(config: dict) -> list[dict]:
         return []
 
 
+def _html_to_text(html: str) -> str:
+    """
+    Visible text of an HTML snippet.
+
+    Uses libxml2 via lxml when installed; BeautifulSoup's pure-Python
+    html.parser is the fallback.
+    """
+    if lxml:
+        try:
+            fragment = lxml.html.fragment_fromstring(html, create_parent="div")
+        except (ValueError, lxml.etree.LxmlError):
+            # libxml2 refuses control characters; html.parser copes
+            pass
+        else:
+            # get_text() leaves out script/style contents; match it
+            for el in list(fragment.iter("script", "style")):
+                el.drop_tree()
+            return fragment.text_content()
+    return BeautifulSoup(html, "html.parser").get_text()
+
+
+def _fetch_feed(feed_conf: dict) -> list[dict]:
+    """Fetch the top entries of one RSS feed ([] on failure)."""
+    feed_name = feed_conf.get("name", "Unknown")
+    feed_url = feed_conf.get("url", "")
+
+    if not feed_url:
+        return []
+
+    try:
+        # Fetched through the shared session; feedparser only parses
+        resp = SESSION.get(
+            feed_url,
+            headers={"User-Agent": feedparser.USER_AGENT},
+            timeout=RSS_TIMEOUT,
+        )
+        resp.raise_for_status()
+        # feedparser looks headers up by lowercase name in a plain dict, so
+        # the charset in Content-Type is only seen once the keys are folded
+        parsed = feedparser.parse(
+            resp.content,
+            response_headers={k.lower(): v for k, v in resp.headers.items()},
+        )
+
+        articles = []
+        for entry in parsed.entries[:5]:  # Top 5 per feed
+            # Extract clean description
+            desc = entry.get("summary", entry.get("description", ""))
+            # Plain-text summaries (no tags or entities) skip the parser
+            if desc and ("<" in desc or "&" in desc):
+                desc = _html_to_text(desc)[:500]
+            elif desc:
+                desc = desc[:500]
+
+            articles.append(
+                {
+                    "title": entry.get("title", ""),
+                    "description": desc,
+                    "url": entry.get("link", ""),
+                    "source": feed_name,
+                    "published_at": entry.get("published", ""),
+                    "fetched_via": "rss",
+                }
+            )
+        log.info(f"RSS [{feed_name}] returned {min(5, len(parsed.entries))} entries.")
+        return articles
+
+    except Exception as e:
+        log.warning(f"RSS [{feed_name}] failed: {e}")
+        return []
+
+
 def fetch_rss_feeds(config: dict) -> list[dict]:
     """
     Fetch articles from configured RSS feeds.
     Free fallback that requires no API key.
+
+    Feeds are fetched concurrently (up to RSS_MAX_WORKERS at a time);
+    articles come back in the configured feed order.
     """
     rss_config = config.get("rss_feeds", {})
     if not rss_config.get("enabled", False):
         log.info("RSS feeds disabled in config, skipping.")
         return []
 
-    articles = []
-    for feed_conf in rss_config.get("feeds", []):
-        feed_name = feed_conf.get("name", "Unknown")
-        feed_url = feed_conf.get("url", "")
+    feeds = rss_config.get("feeds", [])
+    if not feeds:
+        return []
 
-        if not feed_url:
-            continue
+    with ThreadPoolExecutor(max_workers=min(RSS_MAX_WORKERS, len(feeds))) as pool:
+        results = list(pool.map(_fetch_feed, feeds))
+
+    return [article for articles in results for article in articles]
+
+
+# Query parameters that only identify the referrer, not the article
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid"}
 
-        try:
-            parsed = feedparser.parse(feed_url)
-            for entry in parsed.entries[:5]:  # Top 5 per feed
-                # Extract clean description
-                desc = entry.get("summary", entry.get("description", ""))
-                if desc:
-                    desc = BeautifulSoup(desc, "html.parser").get_text()[:500]
-
-                articles.append(
-                    {
-                        "title": entry.get("title", ""),
-                        "description": desc,
-                        "url": entry.get("link", ""),
-                        "source": feed_name,
-                        "published_at": entry.get("published", ""),
-                        "fetched_via": "rss",
-                    }
-                )
-            log.info(f"RSS [{feed_name}] returned {min(5, len(parsed.entries))} entries.")
-
-        except Exception as e:
-            log.warning(f"RSS [{feed_name}] failed: {e}")
-            continue
-
-    return articles
+
+def _canonical_url(url: str) -> str:
+    """
+    Reduce a URL to the form used for duplicate detection.
+
+    Scheme and fragment are ignored, the host is lowercased, a trailing
+    slash is dropped and utm_* / click-tracking parameters are removed, so
+    the same story syndicated with different tracking links collapses.
+    """
+    parts = urlsplit(url)
+    query = urlencode(
+        [
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.startswith("utm_") and k not in TRACKING_PARAMS
+        ]
+    )
+    return urlunsplit(("", parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
 
 
 def deduplicate(articles: list[dict]) -> list[dict]:
-    """Remove duplicate articles based on URL hash."""
+    """Remove duplicate articles based on canonical URL, keeping the first seen."""
     seen = set()
     unique = []
     for art in articles:
-        url_hash = hashlib.md5(art["url"].encode()).hexdigest()
-        if url_hash not in seen:
-            seen.add(url_hash)
+        url = _canonical_url(art["url"])
+        if url not in seen:
+            seen.add(url)
             unique.append(art)
     return unique
 
 
 def build_summary(articles: list[dict]) -> str:
     """Build a text summary of top articles for the Writer."""
-    lines = []
-    for i, art in enumerate(articles[:10], 1):
-        lines.append(f"{i}. [{art['source']}] {art['title']}")
-        if art["description"]:
-            lines.append(f"   {art['description'][:200]}")
-        lines.append(f"   URL: {art['url']}")
-        lines.append("")
-    return "\n".join(lines)
+    return "\n".join(
+        f"{i}. [{art['source']}] {art['title']}\n"
+        + (f"   {art['description'][:200]}\n" if art["description"] else "")
+        + f"   URL: {art['url']}\n"
+        for i, art in enumerate(articles[:10], 1)
+    )
+
+
+# Set by SIGTERM/SIGINT; wakes the scheduler so the container stops promptly
+_stop = threading.Event()
+
+
+def _request_stop(signum, frame):
+    log.info(f"Received signal {signum} — stopping after the current scrape.")
+    _stop.set()
 
 
 def run_scraper():
-    """Main scraper loop."""
+    """
+    Main scraper loop.
+
+    Runs are aligned to the wall clock (every interval_hours since the
+    epoch) so they don't drift by the scrape duration, and the wait
+    between runs ends immediately on SIGTERM.
+    """
     config = load_config()
     schedule_config = config.get("schedule", {})
     interval_hours = schedule_config.get("interval_hours", 6)
     max_articles = schedule_config.get("max_articles", 20)
+    # At least one second: interval_hours=0 (scrape continuously) would
+    # otherwise divide by zero when aligning to the clock below
+    interval = max(interval_hours * 3600, 1)
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
 
-    while True:
+    while not _stop.is_set():
         log.info("=" * 50)
         log.info("Starting news scrape...")
 
@@ -201,7 +334,7 @@ def run_scraper():
         else:
             # Build output
             output = {
-                "scraped_at": datetime.utcnow().isoformat(),
+                "scraped_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
                 "article_count": len(unique_articles),
                 "summary": build_summary(unique_articles),
                 "articles": unique_articles,
@@ -210,17 +343,18 @@ def run_scraper():
             # Ensure output directory exists
             OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-            # Write atomically (write to temp, then rename)
-            tmp_path = OUTPUT_PATH.with_suffix(".tmp")
-            with open(tmp_path, "w") as f:
-                json.dump(output, f, indent=2, default=str)
-            tmp_path.rename(OUTPUT_PATH)
+            # Write atomically (write to temp, then replace)
+            write_atomic(OUTPUT_PATH, dumps(output))
 
             log.info(f"✅ Wrote {len(unique_articles)} articles to {OUTPUT_PATH}")
 
-        # Sleep until next run
-        log.info(f"Sleeping {interval_hours} hours until next scrape...")
-        time.sleep(interval_hours * 3600)
+        # Sleep until the next interval boundary
+        sleep_s = interval - (time.time() % interval)
+        log.info(f"Sleeping {sleep_s / 3600:.2f} hours until next scrape...")
+        if _stop.wait(sleep_s):
+            break
+
+    log.info("Scraper stopped.")
 
 
 if __name__ == "__main__":
@@ -233,15 +367,14 @@ if __name__ == "__main__":
         unique_articles = deduplicate(all_articles)[:20]
 
         output = {
-            "scraped_at": datetime.utcnow().isoformat(),
+            "scraped_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "article_count": len(unique_articles),
             "summary": build_summary(unique_articles),
             "articles": unique_articles,
         }
 
         OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_PATH, "w") as f:
-            json.dump(output, f, indent=2, default=str)
+        write_atomic(OUTPUT_PATH, dumps(output))
 
         log.info(f"✅ Single scrape complete: {len(unique_articles)} articles")
     else:
@@ -0,0 +1,71 @@
+"""
+Shared pytest fixtures for the ClawdBot test harness.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def pytest_configure(config):
+    """Register the benchmark marker even when pytest-benchmark isn't loaded."""
+    config.addinivalue_line("markers", "benchmark: pytest-benchmark timing test")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip tests marked benchmark unless benchmarks were asked for.
+
+    pytest-benchmark would otherwise time them in every plain run.
+    --benchmark-only or --benchmark-enable opts in.
+    """
+    if config.getoption("benchmark_only", False) or config.getoption("benchmark_enable", False):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --benchmark-only or --benchmark-enable")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _env(tmp_path_factory):
+    """
+    Test API keys and scratch data paths, set once for the whole session.
+
+    writer.py and auto_curate.py read these at import time; the original
+    environment is restored when the session ends.
+    """
+    data = tmp_path_factory.mktemp("env")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GEMINI_API_KEY", "test-key-for-testing-only-1234567890")
+        mp.setenv("ANTHROPIC_API_KEY", "sk-ant-REDACTED")
+        mp.setenv("NEWS_PATH", str(data / "news.json"))
+        mp.setenv("DRAFTS_PATH", str(data / "drafts"))
+        mp.setenv("RAG_PATH", str(data / "rag.json"))
+        mp.setenv("CLAWDBOT_LOCAL_TEST", "1")
+        yield data
+
+
+@pytest.fixture(scope="session")
+def writer_mod(_env):
+    """The writer.writer module, imported once per test session."""
+    import writer.writer as writer_module
+    return writer_module
+
+
+@pytest.fixture(scope="session")
+def curator_mod(_env):
+    """The writer.auto_curate module, imported once per test session."""
+    import writer.auto_curate as curator_module
+    return curator_module
+
+
+@pytest.fixture(scope="session")
+def scraper_mod(_env):
+    """The scraper.scraper module, imported once per test session."""
+    import scraper.scraper as scraper_module
+    return scraper_module
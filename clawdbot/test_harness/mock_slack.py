@@ -11,12 +11,36 @@ Usage:
 
     # In another terminal, start the publisher
     SLACK_BOT_TOKEN=mock FLASK_PORT=5001 python publisher/webhook_receiver.py
+
+    # For stress tests, serve with more threads (keep -w 1: the message
+    # store is in-process, so a second worker would see other messages)
+    gunicorn -w 1 -k gthread --threads 16 -b 0.0.0.0:5002 --chdir test_harness mock_slack:app
+
+The server runs under waitress when it is installed (pip install
+waitress); set DEV_RELOAD=1 to use Flask's reloading dev server instead.
 """
 
+import os
 import json
+import time
 import logging
-from datetime import datetime
+from collections import deque
+from itertools import islice
+from datetime import datetime, timezone
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
 
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
@@ -26,40 +50,86 @@ logging.basicConfig(
 )
 log = logging.getLogger("mock_slack")
 
+
+# ── HTTP Session ─────────────────────────────────────
+# Simulated button clicks reuse keep-alive connections to the webhook
+# receiver instead of opening a new socket per call.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    return orjson.dumps(obj, default=str).decode() if orjson else json.dumps(obj, default=str)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Route jsonify() and request.json through orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson:
+    app.json = OrjsonProvider(app)
+
+
+def _json_body() -> dict:
+    """
+    Parse the request body as JSON regardless of Content-Type.
+
+    Malformed bodies yield {} rather than a 400, and the parsed value is
+    cached on the request.
+    """
+    return request.get_json(force=True, silent=True, cache=True) or {}
 
-# Store all received messages for inspection
-message_store = []
+
+# Store received messages for inspection — only the most recent
+# MOCK_SLACK_MAX_MESSAGES are kept so long sessions stay bounded. The store
+# lives in process memory, so the server must run as a single process.
+MAX_MESSAGES = int(os.getenv("MOCK_SLACK_MAX_MESSAGES", "1000"))
+message_store: deque = deque(maxlen=MAX_MESSAGES)
+# Blocks logged per message; the approval message itself has six
+MAX_LOGGED_BLOCKS = 10
 
 
 @app.route("/api/chat.postMessage", methods=["POST"])
 def mock_post_message():
     """Mock Slack chat.postMessage API."""
-    data = request.json or {}
+    data = _json_body()
+    now = time.time()
 
     message = {
         "channel": data.get("channel", "#test"),
         "text": data.get("text", ""),
         "blocks": data.get("blocks", []),
-        "ts": str(datetime.utcnow().timestamp()),
-        "received_at": datetime.utcnow().isoformat(),
+        "ts": f"{now:.6f}",
+        "received_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
     }
 
     message_store.append(message)
 
-    log.info(f"📨 Message received for channel: {message['channel']}")
-    log.info(f"   Text: {message['text'][:100]}")
+    # %-style args so nothing is formatted when INFO is filtered out
+    log.info("📨 Message received for channel: %s", message["channel"])
+    log.info("   Text: %.100s", message["text"])
 
-    # Print blocks for debugging
-    if message["blocks"]:
-        for block in message["blocks"]:
+    # Print blocks for debugging (only the first few of a large message)
+    blocks = message["blocks"]
+    if blocks and log.isEnabledFor(logging.INFO):
+        for block in islice(blocks, MAX_LOGGED_BLOCKS):
             block_type = block.get("type", "unknown")
             if block_type == "section":
-                text = block.get("text", {}).get("text", "")[:100]
-                log.info(f"   Block [section]: {text}")
+                log.info("   Block [section]: %.100s", block.get("text", {}).get("text", ""))
             elif block_type == "actions":
                 buttons = [e.get("text", {}).get("text", "") for e in block.get("elements", [])]
-                log.info(f"   Block [actions]: {', '.join(buttons)}")
+                log.info("   Block [actions]: %s", ", ".join(buttons))
+        if len(blocks) > MAX_LOGGED_BLOCKS:
+            log.info("   ... %d more blocks", len(blocks) - MAX_LOGGED_BLOCKS)
 
     return jsonify({
         "ok": True,
@@ -75,25 +145,35 @@ def mock_post_message():
 @app.route("/api/chat.update", methods=["POST"])
 def mock_update_message():
     """Mock Slack chat.update API."""
-    data = request.json or {}
-    log.info(f"📝 Message updated: {data.get('text', '')[:100]}")
+    data = _json_body()
+    log.info("📝 Message updated: %.100s", data.get("text", ""))
     return jsonify({"ok": True})
 
 
 @app.route("/api/views.open", methods=["POST"])
 def mock_views_open():
     """Mock Slack views.open API (modals)."""
-    data = request.json or {}
-    log.info(f"🪟 Modal opened: {json.dumps(data.get('view', {}).get('title', {}))}")
+    data = _json_body()
+    log.info("🪟 Modal opened: %r", data.get("view", {}).get("title", {}))
     return jsonify({"ok": True})
 
 
 @app.route("/messages", methods=["GET"])
 def list_messages():
-    """Debug endpoint: list all received messages."""
+    """
+    Debug endpoint: list all received messages.
+
+    Pass ?fields=channel,ts to return only those keys of each message
+    (e.g. to skip the blocks) instead of the full records.
+    """
+    fields = [f for f in request.args.get("fields", "").split(",") if f]
+    if fields:
+        messages = [{f: m.get(f) for f in fields} for m in message_store]
+    else:
+        messages = list(message_store)
     return jsonify({
-        "messages": message_store,
-        "count": len(message_store),
+        "messages": messages,
+        "count": len(messages),
     })
 
 
@@ -108,12 +188,10 @@ def simulate_approve():
           -H "Content-Type: application/json" \
           -d '{"draft_filename": "test_draft.json", "webhook_url": "http://localhost:5000/slack/actions"}'
     """
-    data = request.json or {}
+    data = _json_body()
     draft_filename = data.get("draft_filename", "test.json")
     webhook_url = data.get("webhook_url", "http://localhost:5000/slack/actions")
 
-    import requests as req
-
     payload = {
         "type": "block_actions",
         "user": {
@@ -134,9 +212,9 @@ def simulate_approve():
     }
 
     try:
-        resp = req.post(
+        resp = SESSION.post(
             webhook_url,
-            data={"payload": json.dumps(payload)},
+            data={"payload": _dumps(payload)},
             timeout=10,
         )
         log.info(f"✅ Simulated approval sent: {resp.status_code}")
@@ -152,12 +230,10 @@ def simulate_approve():
 @app.route("/simulate/reject", methods=["POST"])
 def simulate_reject():
     """Simulate a user clicking the 'Reject' button."""
-    data = request.json or {}
+    data = _json_body()
     draft_filename = data.get("draft_filename", "test.json")
     webhook_url = data.get("webhook_url", "http://localhost:5000/slack/actions")
 
-    import requests as req
-
     payload = {
         "type": "block_actions",
         "user": {"id": "U_MOCK_USER", "username": "test_user"},
@@ -173,9 +249,9 @@ def simulate_reject():
     }
 
     try:
-        resp = req.post(
+        resp = SESSION.post(
             webhook_url,
-            data={"payload": json.dumps(payload)},
+            data={"payload": _dumps(payload)},
             timeout=10,
         )
         return jsonify({"ok": True, "status": resp.status_code})
@@ -198,4 +274,12 @@ if __name__ == "__main__":
     log.info(f"   Messages endpoint: http://localhost:{port}/messages")
     log.info(f"   Simulate approve: POST http://localhost:{port}/simulate/approve")
     log.info(f"   Simulate reject:  POST http://localhost:{port}/simulate/reject")
-    app.run(host="0.0.0.0", port=port, debug=True)
+    if os.getenv("DEV_RELOAD"):
+        app.run(host="0.0.0.0", port=port, debug=True)
+    elif serve:
+        # A worker pool, so a /simulate/* call blocked on the webhook
+        # doesn't stall chat.postMessage from the publisher
+        serve(app, host="0.0.0.0", port=port, threads=16, connection_limit=200, channel_timeout=30)
+    else:
+        log.warning("waitress not installed — falling back to the Flask dev server")
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
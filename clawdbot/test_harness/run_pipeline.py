@@ -15,13 +15,14 @@ Usage:
     python test_harness/run_pipeline.py --stage writer --mock
 """
 
-import json
 import os
+import re
 import sys
 import shutil
 import tempfile
 import hashlib
 import logging
+import functools
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -30,22 +31,27 @@ from typing import Optional
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from writer._jsonio import read_json, write_json
+
+NEWS_FIXTURE = PROJECT_ROOT / "data" / "news" / "latest.json"
+RAG_FILE = PROJECT_ROOT / "data" / "rag" / "vc_corpus.json"
+SCRAPER_CONFIG = str(PROJECT_ROOT / "scraper" / "config.yaml")
+
 # ── Load .env file ───────────────────────────────────
+# KEY=VALUE per line; blank lines, comments and lines without "=" never
+# match. Surrounding whitespace is trimmed from both key and value.
+_ENV_LINE_RE = re.compile(rb"^[^\S\n]*([^#=\s][^=\n]*?)[^\S\n]*=[^\S\n]*([^\n]*?)[^\S\n]*$", re.M)
+
+
 def load_dotenv(env_path: Path):
     """Load environment variables from .env file."""
     if not env_path.exists():
         return
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, _, value = line.partition("=")
-            key = key.strip()
-            value = value.strip()
-            # Don't overwrite existing env vars
-            if key and value and key not in os.environ:
-                os.environ[key] = value
+    for m in _ENV_LINE_RE.finditer(env_path.read_bytes()):
+        key, value = m.group(1).decode(), m.group(2).decode()
+        # Don't overwrite existing env vars
+        if value and key not in os.environ:
+            os.environ[key] = value
 
 load_dotenv(PROJECT_ROOT / ".env")
 
@@ -70,33 +76,90 @@ class C:
     END = "\033[0m"
 
 
+_BANNER_RULE = "═" * 60
+_HR = "─" * 60
+
+# Prefixes for the status helpers, joined once instead of per call
+_STEP = f"{C.BLUE}{C.BOLD}[Step "
+_STEP_END = f"]{C.END} "
+_OK = f"  {C.GREEN}✅ "
+_WARN = f"  {C.YELLOW}⚠️  "
+_ERR = f"  {C.RED}❌ "
+_INFO = f"  {C.DIM}"
+_END = C.END
+
+
 def banner(text: str, color: str = C.CYAN):
     """Print a colorized banner."""
-    width = 60
-    print(f"\n{color}{C.BOLD}{'═' * width}")
-    print(f"  {text}")
-    print(f"{'═' * width}{C.END}\n")
+    print(f"\n{color}{C.BOLD}{_BANNER_RULE}\n  {text}\n{_BANNER_RULE}{_END}\n")
 
 
 def step(num: int, text: str):
     """Print a pipeline step."""
-    print(f"{C.BLUE}{C.BOLD}[Step {num}]{C.END} {text}")
+    print(f"{_STEP}{num}{_STEP_END}{text}")
 
 
 def success(text: str):
-    print(f"  {C.GREEN}✅ {text}{C.END}")
+    print(_OK + text + _END)
 
 
 def warning(text: str):
-    print(f"  {C.YELLOW}⚠️  {text}{C.END}")
+    print(_WARN + text + _END)
 
 
 def error(text: str):
-    print(f"  {C.RED}❌ {text}{C.END}")
+    print(_ERR + text + _END)
 
 
 def info(text: str):
-    print(f"  {C.DIM}{text}{C.END}")
+    print(_INFO + text + _END)
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601, to the second."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ── Live Stage Modules ───────────────────────────────
+# Imported on first live use (mock runs never pay for them) and cached
+# so repeated runs in one process skip the import machinery.
+@functools.cache
+def _scraper():
+    from scraper import scraper
+    return scraper
+
+
+@functools.cache
+def _writer():
+    from writer import writer
+    return writer
+
+
+@functools.cache
+def _social_poster():
+    from publisher import social_poster
+    return social_poster
+
+
+# ── Mock Draft ───────────────────────────────────────
+# A realistic draft used by the mock Writer stage; its id is fixed, so it
+# is hashed once at import
+MOCK_DRAFT_TEXT = (
+    "The AI funding landscape continues to evolve rapidly. According to "
+    "TechCrunch, startup funding in the AI sector hit $120B in 2025, driven "
+    "largely by enterprise adoption across financial services and healthcare.\n\n"
+    "What's particularly noteworthy isn't just the capital flowing in — it's "
+    "the quality of companies being built. We're seeing a new generation of "
+    "startups that are capital-efficient from day one, leveraging AI not just "
+    "as a product feature but as a fundamental operating advantage.\n\n"
+    "At Z5 Capital, we believe the most durable companies in this wave will "
+    "be those solving genuine enterprise pain points rather than chasing "
+    "the latest model release. The infrastructure layer is maturing, and "
+    "the application layer opportunity is enormous.\n\n"
+    "The question isn't whether AI will transform every industry — it's "
+    "which founders will build the defining companies of this era."
+)
+MOCK_DRAFT_ID = hashlib.blake2b(MOCK_DRAFT_TEXT.encode(), digest_size=4).hexdigest()
 
 
 # ═══════════════════════════════════════════════════════
@@ -117,14 +180,15 @@ def stage_scraper(work_dir: Path, mock: bool = True) -> Optional[Path]:
         step(1, "Using mock news data...")
 
         # Copy fixture if available, else generate
-        fixture = Path(__file__).parent.parent / "data" / "news" / "latest.json"
+        fixture = NEWS_FIXTURE
         if fixture.exists():
-            shutil.copy(fixture, news_file)
+            shutil.copyfile(fixture, news_file)
+            data = read_json(news_file)
             success(f"Copied fixture: {fixture.name}")
         else:
             # Generate mock news inline
-            news = {
-                "scraped_at": datetime.utcnow().isoformat(),
+            data = {
+                "scraped_at": _now_iso(),
                 "article_count": 3,
                 "summary": (
                     "1. [TechCrunch] AI Startup Funding Hits Record $120B\n"
@@ -148,34 +212,31 @@ def stage_scraper(work_dir: Path, mock: bool = True) -> Optional[Path]:
                     }
                 ],
             }
-            with open(news_file, "w") as f:
-                json.dump(news, f, indent=2)
+            write_json(news_file, data)
             success("Generated mock news data")
     else:
         step(1, "Running live scraper...")
         os.environ["CLAWDBOT_LOCAL_TEST"] = "1"
-        os.environ["CONFIG_PATH"] = str(Path(__file__).parent.parent / "scraper" / "config.yaml")
+        os.environ["CONFIG_PATH"] = SCRAPER_CONFIG
         os.environ["OUTPUT_PATH"] = str(news_file)
 
         try:
-            from scraper.scraper import fetch_newsapi, fetch_rss_feeds, deduplicate, build_summary
-            from scraper.scraper import load_config
+            scraper = _scraper()
 
-            config = load_config()
+            config = scraper.load_config()
             articles = []
-            articles.extend(fetch_newsapi(config))
-            articles.extend(fetch_rss_feeds(config))
-            unique = deduplicate(articles)[:10]
+            articles.extend(scraper.fetch_newsapi(config))
+            articles.extend(scraper.fetch_rss_feeds(config))
+            unique = scraper.deduplicate(articles)[:10]
 
             if unique:
-                output = {
-                    "scraped_at": datetime.utcnow().isoformat(),
+                data = {
+                    "scraped_at": _now_iso(),
                     "article_count": len(unique),
-                    "summary": build_summary(unique),
+                    "summary": scraper.build_summary(unique),
                     "articles": unique,
                 }
-                with open(news_file, "w") as f:
-                    json.dump(output, f, indent=2)
+                write_json(news_file, data)
                 success(f"Scraped {len(unique)} articles")
             else:
                 warning("No articles scraped — falling back to mock")
@@ -185,8 +246,6 @@ def stage_scraper(work_dir: Path, mock: bool = True) -> Optional[Path]:
             warning("Falling back to mock data")
             return stage_scraper(work_dir, mock=True)
 
-    with open(news_file) as f:
-        data = json.load(f)
     info(f"Articles: {data['article_count']}")
     info(f"Preview: {data['summary'][:150]}...")
 
@@ -202,7 +261,6 @@ def stage_writer(work_dir: Path, mock: bool = True) -> Optional[Path]:
     drafts_dir.mkdir(parents=True, exist_ok=True)
 
     news_file = work_dir / "data" / "news" / "latest.json"
-    rag_file = Path(__file__).parent.parent / "data" / "rag" / "vc_corpus.json"
 
     if not news_file.exists():
         error("News file missing — run scraper stage first")
@@ -212,34 +270,16 @@ def stage_writer(work_dir: Path, mock: bool = True) -> Optional[Path]:
         step(2, "Generating mock draft (no Claude API call)...")
 
         # Load news for context
-        with open(news_file) as f:
-            news = json.load(f)
-
-        # Generate a realistic mock draft
-        mock_draft_text = (
-            "The AI funding landscape continues to evolve rapidly. According to "
-            "TechCrunch, startup funding in the AI sector hit $120B in 2025, driven "
-            "largely by enterprise adoption across financial services and healthcare.\n\n"
-            "What's particularly noteworthy isn't just the capital flowing in — it's "
-            "the quality of companies being built. We're seeing a new generation of "
-            "startups that are capital-efficient from day one, leveraging AI not just "
-            "as a product feature but as a fundamental operating advantage.\n\n"
-            "At Z5 Capital, we believe the most durable companies in this wave will "
-            "be those solving genuine enterprise pain points rather than chasing "
-            "the latest model release. The infrastructure layer is maturing, and "
-            "the application layer opportunity is enormous.\n\n"
-            "The question isn't whether AI will transform every industry — it's "
-            "which founders will build the defining companies of this era."
-        )
-
-        timestamp = datetime.utcnow().isoformat()
-        draft_id = hashlib.md5(mock_draft_text.encode()).hexdigest()[:8]
+        news = read_json(news_file)
+
+        timestamp = _now_iso()
+        draft_id = MOCK_DRAFT_ID
 
         draft_data = {
-            "text": mock_draft_text,
+            "text": MOCK_DRAFT_TEXT,
             "created_at": timestamp,
             "draft_id": draft_id,
-            "word_count": len(mock_draft_text.split()),
+            "word_count": len(MOCK_DRAFT_TEXT.split()),
             "news_source": news.get("articles", [{}])[0].get("url", ""),
             "news_scraped_at": news.get("scraped_at", ""),
             "model": "mock-model",
@@ -250,12 +290,11 @@ def stage_writer(work_dir: Path, mock: bool = True) -> Optional[Path]:
         }
 
         draft_file = drafts_dir / f"{timestamp.replace(':', '-')}_{draft_id}.json"
-        with open(draft_file, "w") as f:
-            json.dump(draft_data, f, indent=2)
+        write_json(draft_file, draft_data)
 
         success(f"Mock draft generated: {draft_data['word_count']} words")
         info(f"Draft ID: {draft_id}")
-        info(f"Preview: {mock_draft_text[:120]}...")
+        info(f"Preview: {MOCK_DRAFT_TEXT[:120]}...")
 
         # Mock critic pass
         step(3, "Running mock critic validation...")
@@ -270,11 +309,10 @@ def stage_writer(work_dir: Path, mock: bool = True) -> Optional[Path]:
         os.environ["CLAWDBOT_LOCAL_TEST"] = "1"
         os.environ["NEWS_PATH"] = str(news_file)
         os.environ["DRAFTS_PATH"] = str(drafts_dir)
-        os.environ["RAG_PATH"] = str(rag_file)
+        os.environ["RAG_PATH"] = str(RAG_FILE)
 
         try:
-            from writer.writer import generate_post
-            result = generate_post()
+            result = _writer().generate_post()
             if result:
                 success(f"Draft generated: {result.name}")
                 return result
@@ -286,22 +324,41 @@ def stage_writer(work_dir: Path, mock: bool = True) -> Optional[Path]:
             return None
 
 
-def stage_approval(draft_file: Path, mock: bool = True) -> Optional[Path]:
+def _read_until_sentinel(sentinel: str = ".") -> str:
+    """
+    Read lines from stdin up to a line holding only sentinel (or EOF).
+
+    Blank lines are kept as paragraph breaks, and input after the sentinel
+    is left for the next prompt.
+    """
+    lines = []
+    for line in iter(sys.stdin.readline, ""):
+        if line.rstrip("\r\n") == sentinel:
+            break
+        lines.append(line)
+    return "".join(lines)
+
+
+def stage_approval(draft_file: Path, mock: bool = True, edit_from: Optional[Path] = None) -> Optional[Path]:
     """
     Stage 3: Human-in-the-Loop Approval.
+
+    If edit_from is given, choosing [e] takes the edited text from that
+    file instead of reading it from the terminal.
     """
     banner("STAGE 3: HUMAN APPROVAL (HITL)", C.RED)
 
-    with open(draft_file) as f:
-        draft = json.load(f)
+    draft = read_json(draft_file)
 
-    # Display the draft for review
-    print(f"{C.BOLD}{'─' * 60}{C.END}")
-    print(f"{C.BOLD}📝 DRAFT FOR REVIEW:{C.END}\n")
-    print(draft["text"])
-    print(f"\n{C.DIM}Source: {draft.get('news_source', 'N/A')}")
-    print(f"Words: {draft['word_count']} | Model: {draft['model']}{C.END}")
-    print(f"{C.BOLD}{'─' * 60}{C.END}\n")
+    # Display the draft for review (one write for the whole block)
+    print(
+        f"{C.BOLD}{_HR}{C.END}\n"
+        f"{C.BOLD}📝 DRAFT FOR REVIEW:{C.END}\n\n"
+        f"{draft['text']}\n"
+        f"\n{C.DIM}Source: {draft.get('news_source', 'N/A')}\n"
+        f"Words: {draft['word_count']} | Model: {draft['model']}{C.END}\n"
+        f"{C.BOLD}{_HR}{C.END}\n"
+    )
 
     if mock:
         step(4, "Simulating Slack approval (auto-approve in mock mode)...")
@@ -313,7 +370,10 @@ def stage_approval(draft_file: Path, mock: bool = True) -> Optional[Path]:
         print("  [y] Approve & Post")
         print("  [n] Reject")
         print("  [e] Edit")
-        approval = input(f"\n{C.BOLD}Your choice (y/n/e): {C.END}").strip().lower()
+        try:
+            approval = input(f"\n{C.BOLD}Your choice (y/n/e): {C.END}").strip().lower()
+        except EOFError:
+            approval = "n"  # Input closed without a decision — reject
 
     approved_dir = draft_file.parent.parent / "approved"
     approved_dir.mkdir(parents=True, exist_ok=True)
@@ -321,45 +381,40 @@ def stage_approval(draft_file: Path, mock: bool = True) -> Optional[Path]:
     if approval == "y":
         # Move to approved
         draft["status"] = "approved"
-        draft["approved_at"] = datetime.utcnow().isoformat()
+        draft["approved_at"] = _now_iso()
         draft["approved_by"] = "test_harness (local)"
 
         approved_file = approved_dir / draft_file.name
-        with open(approved_file, "w") as f:
-            json.dump(draft, f, indent=2)
+        write_json(approved_file, draft)
 
         draft_file.unlink()
         success("Draft APPROVED ✓")
         return approved_file
 
     elif approval == "e":
-        print(f"\n{C.YELLOW}Enter edited text (press Enter twice to finish):{C.END}")
-        lines = []
-        while True:
-            line = input()
-            if line == "":
-                break
-            lines.append(line)
-
-        if lines:
+        if edit_from:
+            edited = Path(edit_from).read_text().strip()
+        else:
+            print(f"\n{C.YELLOW}Enter edited text, then a line with just '.' to finish:{C.END}")
+            edited = _read_until_sentinel().strip()
+
+        if edited:
             draft["original_text"] = draft["text"]
-            draft["text"] = "\n".join(lines)
+            draft["text"] = edited
             draft["edited_by"] = "test_harness (local)"
 
-            with open(draft_file, "w") as f:
-                json.dump(draft, f, indent=2)
+            write_json(draft_file, draft)
 
             success("Draft edited — re-running approval...")
             return stage_approval(draft_file, mock=False)
 
     else:
         draft["status"] = "rejected"
-        draft["rejected_at"] = datetime.utcnow().isoformat()
+        draft["rejected_at"] = _now_iso()
         draft["rejected_by"] = "test_harness (local)"
 
         rejected_name = f"REJECTED_{draft_file.name}"
-        with open(draft_file.parent / rejected_name, "w") as f:
-            json.dump(draft, f, indent=2)
+        write_json(draft_file.parent / rejected_name, draft)
         draft_file.unlink()
 
         error("Draft REJECTED ✗")
@@ -373,8 +428,7 @@ def stage_publisher(approved_file: Path, mock: bool = True, skip_platforms: list
     skip_platforms = skip_platforms or []
     banner("STAGE 4: PUBLISHER", C.GREEN)
 
-    with open(approved_file) as f:
-        draft = json.load(f)
+    draft = read_json(approved_file)
 
     if skip_platforms:
         info(f"Skipping platforms: {', '.join(skip_platforms)}")
@@ -391,8 +445,7 @@ def stage_publisher(approved_file: Path, mock: bool = True, skip_platforms: list
     else:
         step(5, "Publishing to social platforms...")
         try:
-            from publisher.social_poster import post_to_all_platforms
-            results = post_to_all_platforms(draft, skip_platforms=skip_platforms)
+            results = _social_poster().post_to_all_platforms(draft, skip_platforms=skip_platforms)
             successes = [p for p, r in results.items() if r.get("success")]
             skipped = [p for p, r in results.items() if r.get("skipped")]
             if successes:
@@ -409,17 +462,42 @@ def stage_publisher(approved_file: Path, mock: bool = True, skip_platforms: list
             return False
 
 
+def print_tree(directory: str | Path, level: int = 0, name: str = ""):
+    """
+    Print a directory tree with file sizes, one scandir per directory.
+
+    Subdirectories recurse with the DirEntry's str path and name, so no
+    Path objects are built below the root.
+    """
+    print(f"{'  ' * (level + 1)}{C.BLUE}{name or Path(directory).name}/{C.END}")
+    sub_indent = "  " * (level + 2)
+    subdirs = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry)
+            else:
+                print(f"{sub_indent}{entry.name} ({entry.stat().st_size} bytes)")
+    for entry in subdirs:
+        print_tree(entry.path, level + 1, entry.name)
+
+
 # ═══════════════════════════════════════════════════════
 # MAIN PIPELINE
 # ═══════════════════════════════════════════════════════
 
 
-def run_full_pipeline(mock: bool = True, stage_filter: str = "all", skip_platforms: list = None):
+def run_full_pipeline(
+    mock: bool = True,
+    stage_filter: str = "all",
+    skip_platforms: list = None,
+    edit_from: Optional[Path] = None,
+):
     """Run the complete pipeline end-to-end."""
     banner("🤖 ClawdBot Pipeline Simulation", C.HEADER)
     print(f"  Mode: {'MOCK (no API calls)' if mock else 'LIVE (real APIs)'}")
     print(f"  Stage: {stage_filter}")
-    print(f"  Time: {datetime.utcnow().isoformat()}")
+    print(f"  Time: {_now_iso()}")
 
     # Create temporary working directory
     work_dir = Path(tempfile.mkdtemp(prefix="clawdbot_"))
@@ -444,7 +522,7 @@ def run_full_pipeline(mock: bool = True, stage_filter: str = "all", skip_platfor
         # ── Stage 3: Approval ────────────────────────
         approved_file = None
         if stage_filter in ("all", "approval") and draft_file:
-            approved_file = stage_approval(draft_file, mock=mock)
+            approved_file = stage_approval(draft_file, mock=mock, edit_from=edit_from)
             if not approved_file:
                 warning("Draft was rejected — pipeline stopping")
                 return False
@@ -461,14 +539,7 @@ def run_full_pipeline(mock: bool = True, stage_filter: str = "all", skip_platfor
 
         # Show file tree
         print(f"{C.BOLD}Generated files:{C.END}")
-        for root, dirs, files in os.walk(work_dir):
-            level = root.replace(str(work_dir), "").count(os.sep)
-            indent = "  " * (level + 1)
-            print(f"{indent}{C.BLUE}{Path(root).name}/{C.END}")
-            sub_indent = "  " * (level + 2)
-            for file in files:
-                size = os.path.getsize(os.path.join(root, file))
-                print(f"{sub_indent}{file} ({size} bytes)")
+        print_tree(work_dir)
 
         return True
 
@@ -479,7 +550,7 @@ def run_full_pipeline(mock: bool = True, stage_filter: str = "all", skip_platfor
         # Optionally clean up
         if mock:
             info(f"\nWork directory preserved at: {work_dir}")
-            info("Delete with: rm -rf " + str(work_dir))
+            info(f"Delete with: rm -rf {work_dir}")
 
 
 if __name__ == "__main__":
@@ -513,6 +584,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Skip Twitter posting",
     )
+    parser.add_argument(
+        "--edit-from",
+        type=Path,
+        help="File holding the edited draft text, used when [e] is chosen in live approval",
+    )
     args = parser.parse_args()
 
     mock_mode = not args.live
@@ -522,5 +598,7 @@ if __name__ == "__main__":
     if args.skip_twitter:
         skip.append("twitter")
 
-    result = run_full_pipeline(mock=mock_mode, stage_filter=args.stage, skip_platforms=skip)
+    result = run_full_pipeline(
+        mock=mock_mode, stage_filter=args.stage, skip_platforms=skip, edit_from=args.edit_from
+    )
     sys.exit(0 if result else 1)
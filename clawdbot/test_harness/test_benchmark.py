@@ -0,0 +1,75 @@
+"""
+ClawdBot Benchmarks — Python overhead of the critic and curator hot paths.
+
+Model calls are replaced with zero-latency fakes, so these time only the
+local work around them (prompt building, reply parsing, fence stripping)
+and give refactors a baseline to compare against.
+
+Skipped in regular runs (see conftest.py); run with:
+    python -m pytest test_harness/test_benchmark.py --benchmark-only
+"""
+
+import json
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DRAFT = (
+    "The AI sector continues to grow, with enterprise adoption accelerating. "
+    "According to TechCrunch, funding hit $120B this year. At Z5 Capital, we're "
+    "excited about the opportunity in applied AI for healthcare and fintech."
+)
+
+POST = (
+    "The best founders I've backed spend their first year talking to customers, "
+    "not raising money. Distribution beats product more often than people admit."
+)
+
+EVALUATION = {
+    "include": True,
+    "quality_score": 8,
+    "category": "founder_advice",
+    "reason": "Actionable, original founder advice.",
+}
+
+
+class MockAnthropicResponse:
+    """Mock Anthropic API response."""
+
+    def __init__(self, text: str):
+        self.content = [MagicMock(text=text)]
+
+
+def test_critic_pass_overhead(benchmark, writer_mod):
+    """critic_pass with an instant structured SAFE verdict."""
+    response = MagicMock(text='{"safe": true, "reason": ""}')
+    with patch.object(writer_mod, "_gemini_response", return_value=response), \
+            patch.object(writer_mod, "critic_cache", None):
+        is_safe, _ = benchmark(writer_mod.critic_pass, DRAFT)
+    assert is_safe
+
+
+@pytest.mark.parametrize("fenced", [False, True], ids=["plain", "fenced"])
+def test_evaluate_post_overhead(benchmark, curator_mod, fenced):
+    """evaluate_post with an instant JSON reply, bare or in a markdown fence."""
+    reply = json.dumps(EVALUATION)
+    if fenced:
+        reply = f"```json\n{reply}\n```"
+
+    with patch.object(curator_mod, "client") as mock_client, \
+            patch.object(curator_mod, "verdict_cache", None):
+        mock_client.messages.create.return_value = MockAnthropicResponse(reply)
+        evaluation = benchmark(curator_mod.evaluate_post, POST, "paulg")
+    assert evaluation == EVALUATION
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--benchmark-only"])
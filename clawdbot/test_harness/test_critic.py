@@ -6,21 +6,26 @@ unsafe content (financial advice, political takes, profanity, etc.)
 """
 
 import json
-import os
+import re
 import sys
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
-class MockAnthropicResponse:
-    """Mock Anthropic API response."""
+class MockGeminiResponse:
+    """Mock Gemini generate_content response."""
 
     def __init__(self, text: str):
-        self.content = [MagicMock(text=text)]
+        self.text = text
+
+
+def _reply(safe: bool, reason: str = "") -> MockGeminiResponse:
+    """A structured critic reply, as JSON mode returns it."""
+    return MockGeminiResponse(json.dumps({"safe": safe, "reason": reason}))
 
 
 # ── Test Data ────────────────────────────────────────
@@ -64,131 +69,254 @@ UNSAFE_DRAFTS_UNVERIFIED = [
 class TestCriticSafeContent:
     """Test that the critic passes safe content."""
 
-    @patch("writer.writer.client")
-    def test_safe_draft_passes(self, mock_client):
+    @pytest.mark.parametrize("draft", SAFE_DRAFTS)
+    @patch("writer.writer._gemini_response")
+    def test_safe_draft_passes(self, mock_response, draft, writer_mod):
         """Safe content should be marked as SAFE."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        os.environ["NEWS_PATH"] = "/tmp/test_news.json"
-        os.environ["DRAFTS_PATH"] = "/tmp/test_drafts"
-        os.environ["RAG_PATH"] = "/tmp/test_rag.json"
+        mock_response.return_value = _reply(True)
 
-        mock_client.messages.create.return_value = MockAnthropicResponse("SAFE")
+        is_safe, reason = writer_mod.critic_pass(draft)
+        assert is_safe, f"Expected SAFE for: {draft[:50]}..."
 
-        from writer.writer import critic_pass
+    @patch("writer.writer._gemini_response")
+    def test_requests_structured_verdict(self, mock_response, writer_mod):
+        """The critic asks for a JSON CriticVerdict at temperature 0."""
+        mock_response.return_value = _reply(True)
 
-        for draft in SAFE_DRAFTS:
-            is_safe, reason = critic_pass(draft)
-            assert is_safe, f"Expected SAFE for: {draft[:50]}..."
+        writer_mod.critic_pass(SAFE_DRAFTS[0])
+
+        prompt = mock_response.call_args.args[0]
+        kwargs = mock_response.call_args.kwargs
+        assert prompt.endswith(SAFE_DRAFTS[0])
+        assert kwargs["temperature"] == 0
+        assert kwargs["system_prompt"] == writer_mod.CONSTITUTION
+        assert kwargs["response_mime_type"] == "application/json"
+        assert kwargs["response_schema"] is writer_mod.CriticVerdict
 
 
 class TestCriticUnsafeContent:
     """Test that the critic flags unsafe content."""
 
-    @patch("writer.writer.client")
-    def test_financial_advice_flagged(self, mock_client):
+    @pytest.mark.parametrize("draft", UNSAFE_DRAFTS_FINANCIAL)
+    @patch("writer.writer._gemini_response")
+    def test_financial_advice_flagged(self, mock_response, draft, writer_mod):
         """Financial advice should be flagged as UNSAFE."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        os.environ["NEWS_PATH"] = "/tmp/test_news.json"
-        os.environ["DRAFTS_PATH"] = "/tmp/test_drafts"
-        os.environ["RAG_PATH"] = "/tmp/test_rag.json"
-
-        mock_client.messages.create.return_value = MockAnthropicResponse(
-            "UNSAFE: Contains financial advice ('guaranteed returns')"
+        mock_response.return_value = _reply(
+            False, "Contains financial advice ('guaranteed returns')"
         )
 
-        from writer.writer import critic_pass
+        is_safe, reason = writer_mod.critic_pass(draft)
+        assert not is_safe, f"Expected UNSAFE for: {draft[:50]}..."
+        assert reason == "Contains financial advice ('guaranteed returns')"
 
-        for draft in UNSAFE_DRAFTS_FINANCIAL:
-            is_safe, reason = critic_pass(draft)
-            assert not is_safe, f"Expected UNSAFE for: {draft[:50]}..."
-            assert len(reason) > 0
-
-    @patch("writer.writer.client")
-    def test_political_content_flagged(self, mock_client):
+    @pytest.mark.parametrize("draft", UNSAFE_DRAFTS_POLITICAL)
+    @patch("writer.writer._gemini_response")
+    def test_political_content_flagged(self, mock_response, draft, writer_mod):
         """Political statements should be flagged."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        mock_client.messages.create.return_value = MockAnthropicResponse(
-            "UNSAFE: Contains political partisan statement"
-        )
-
-        from writer.writer import critic_pass
+        mock_response.return_value = _reply(False, "Contains political partisan statement")
 
-        for draft in UNSAFE_DRAFTS_POLITICAL:
-            is_safe, reason = critic_pass(draft)
-            assert not is_safe
+        is_safe, reason = writer_mod.critic_pass(draft)
+        assert not is_safe
 
-    @patch("writer.writer.client")
-    def test_profanity_flagged(self, mock_client):
+    @pytest.mark.parametrize("draft", UNSAFE_DRAFTS_PROFANITY)
+    @patch("writer.writer._gemini_response")
+    def test_profanity_flagged(self, mock_response, draft, writer_mod):
         """Profanity should be flagged."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        mock_client.messages.create.return_value = MockAnthropicResponse(
-            "UNSAFE: Contains profanity"
-        )
-
-        from writer.writer import critic_pass
+        mock_response.return_value = _reply(False, "Contains profanity")
 
-        for draft in UNSAFE_DRAFTS_PROFANITY:
-            is_safe, reason = critic_pass(draft)
-            assert not is_safe
+        is_safe, reason = writer_mod.critic_pass(draft)
+        assert not is_safe
 
 
 class TestCriticEdgeCases:
     """Test critic behavior with edge cases."""
 
-    @patch("writer.writer.client")
-    def test_ambiguous_response_treated_as_unsafe(self, mock_client):
+    @patch("writer.writer._gemini_response")
+    def test_ambiguous_response_treated_as_unsafe(self, mock_response, writer_mod):
         """Non-standard critic response should be treated as UNSAFE."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-
-        mock_client.messages.create.return_value = MockAnthropicResponse(
+        mock_response.return_value = MockGeminiResponse(
             "I'm not sure about this draft. It might be okay."
         )
 
-        from writer.writer import critic_pass
-
-        is_safe, reason = critic_pass("Some draft text")
+        is_safe, reason = writer_mod.critic_pass("Some draft text")
         assert not is_safe, "Ambiguous response should be treated as unsafe"
 
-    @patch("writer.writer.client")
-    def test_api_error_treated_as_unsafe(self, mock_client):
+    @pytest.mark.parametrize("reply", [
+        '{"safe": tru',                          # truncated JSON
+        '{"safe": "yes", "reason": ""}',         # safe is not a bool
+        '{"reason": "looks fine"}',              # safe missing
+        '[{"safe": true, "reason": ""}]',        # array instead of object
+        '"SAFE"',                                # JSON string, not a verdict
+        "",
+    ])
+    @patch("writer.writer._gemini_response")
+    def test_unparsable_reply_fails_closed(self, mock_response, reply, writer_mod):
+        """Replies that don't decode to a verdict are treated as UNSAFE."""
+        mock_response.return_value = MockGeminiResponse(reply)
+
+        is_safe, reason = writer_mod.critic_pass("Some draft text")
+        assert not is_safe
+        assert "ambiguous" in reason.lower()
+
+    @patch("writer.writer._gemini_response")
+    def test_api_error_treated_as_unsafe(self, mock_response, writer_mod):
         """API errors should be treated as UNSAFE (fail-safe)."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
+        mock_response.side_effect = Exception("API timeout")
 
-        mock_client.messages.create.side_effect = Exception("API timeout")
-
-        from writer.writer import critic_pass
-
-        is_safe, reason = critic_pass("Some draft text")
+        is_safe, reason = writer_mod.critic_pass("Some draft text")
         assert not is_safe, "API error should be treated as unsafe"
         assert "error" in reason.lower()
 
-    @patch("writer.writer.client")
-    def test_safe_with_trailing_whitespace(self, mock_client):
-        """SAFE with trailing whitespace should still pass."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
+    @patch("writer.writer._gemini_response")
+    def test_json_with_surrounding_whitespace(self, mock_response, writer_mod):
+        """A verdict padded with whitespace should still parse."""
+        mock_response.return_value = MockGeminiResponse('  {"safe": true, "reason": ""}\n')
 
-        mock_client.messages.create.return_value = MockAnthropicResponse(
-            "SAFE  \n"
+        is_safe, reason = writer_mod.critic_pass("Valid draft text")
+        assert is_safe
+
+    @patch("writer.writer._gemini_response")
+    def test_legacy_plain_text_reply(self, mock_response, writer_mod):
+        """SAFE / UNSAFE: <reason> replies (no JSON mode) are still understood."""
+        mock_response.return_value = MockGeminiResponse("SAFE  \n")
+        assert writer_mod.critic_pass("Valid draft text")[0]
+
+        mock_response.return_value = MockGeminiResponse("UNSAFE: Contains profanity")
+        assert writer_mod.critic_pass("Valid draft text") == (False, "Contains profanity")
+
+
+class TestCriticVerdict:
+    """Test decoding of a single CriticVerdict object."""
+
+    @pytest.mark.parametrize("result, expected", [
+        ({"safe": True, "reason": ""}, (True, "Passed all constitutional checks")),
+        ({"safe": True, "reason": "ignored"}, (True, "Passed all constitutional checks")),
+        ({"safe": True}, (True, "Passed all constitutional checks")),
+        ({"safe": False, "reason": "Profanity"}, (False, "Profanity")),
+        ({"safe": False, "reason": ""}, (False, "Rejected by critic")),
+        ({"safe": False, "reason": None}, (False, "Rejected by critic")),
+        ({"safe": False}, (False, "Rejected by critic")),
+    ])
+    def test_well_formed(self, result, expected, writer_mod):
+        """Verdict objects map to (is_safe, reason)."""
+        assert writer_mod._verdict(result) == expected
+
+    @pytest.mark.parametrize("result", [
+        None,
+        "SAFE",
+        [],
+        [{"safe": True}],
+        {},
+        {"reason": "ok"},
+        {"safe": 1, "reason": ""},
+        {"safe": "false", "reason": ""},
+        {"safe": None},
+    ])
+    def test_malformed_returns_none(self, result, writer_mod):
+        """Anything that isn't an object with a boolean 'safe' is rejected."""
+        assert writer_mod._verdict(result) is None
+
+
+class TestCriticBatch:
+    """Test batched critic calls and their per-draft fallback."""
+
+    @patch("writer.writer._gemini_response")
+    def test_one_call_for_several_drafts(self, mock_response, writer_mod):
+        """All drafts are judged by one request, verdicts in input order."""
+        mock_response.return_value = MockGeminiResponse(json.dumps([
+            {"safe": True, "reason": ""},
+            {"safe": False, "reason": "Contains profanity"},
+        ]))
+
+        verdicts = writer_mod.critic_pass_batch(SAFE_DRAFTS[:1] + UNSAFE_DRAFTS_PROFANITY)
+
+        assert verdicts == [
+            (True, "Passed all constitutional checks"),
+            (False, "Contains profanity"),
+        ]
+        mock_response.assert_called_once()
+        prompt = mock_response.call_args.args[0]
+        assert "DRAFT 1:\n" + SAFE_DRAFTS[0] in prompt
+        assert "DRAFT 2:\n" + UNSAFE_DRAFTS_PROFANITY[0] in prompt
+        assert mock_response.call_args.kwargs["response_schema"] == list[writer_mod.CriticVerdict]
+
+    @patch("writer.writer._gemini_response")
+    def test_single_draft_uses_critic_pass(self, mock_response, writer_mod):
+        """One draft skips the batch prompt and goes through critic_pass."""
+        mock_response.return_value = _reply(True)
+
+        assert writer_mod.critic_pass_batch(SAFE_DRAFTS[:1]) == [
+            (True, "Passed all constitutional checks")
+        ]
+        mock_response.assert_called_once()
+        assert mock_response.call_args.kwargs["response_schema"] is writer_mod.CriticVerdict
+
+    def test_empty_batch(self, writer_mod):
+        """No drafts, no verdicts (and no request)."""
+        with patch("writer.writer._gemini_response") as mock_response:
+            assert writer_mod.critic_pass_batch([]) == []
+        mock_response.assert_not_called()
+
+    @pytest.mark.parametrize("reply", [
+        '[{"safe": true, "reason": ""}]',                                   # too few
+        '[{"safe": true, "reason": ""}, {"safe": "no"}]',                  # one malformed
+        '{"safe": true, "reason": ""}',                                     # object, not list
+        '{"a": {"safe": true}, "b": {"safe": true}}',                       # two-key object
+        "[{",                                                               # not JSON
+    ])
+    @patch("writer.writer._gemini_response")
+    def test_malformed_reply_falls_back_per_draft(self, mock_response, reply, writer_mod):
+        """A batch reply that can't be matched to the drafts is not used at all."""
+        mock_response.side_effect = [
+            MockGeminiResponse(reply),
+            _reply(False, "Political"),
+            _reply(True),
+        ]
+
+        verdicts = writer_mod.critic_pass_batch(UNSAFE_DRAFTS_POLITICAL[:1] + SAFE_DRAFTS[:1])
+
+        assert verdicts == [(False, "Political"), (True, "Passed all constitutional checks")]
+        schemas = [c.kwargs["response_schema"] for c in mock_response.call_args_list]
+        assert schemas == [list[writer_mod.CriticVerdict]] + [writer_mod.CriticVerdict] * 2
+
+    @patch("writer.writer._gemini_response")
+    def test_batch_error_falls_back_per_draft(self, mock_response, writer_mod):
+        """An API error on the batch call retries each draft on its own."""
+        mock_response.side_effect = [Exception("API timeout"), _reply(True), _reply(True)]
+
+        assert [v[0] for v in writer_mod.critic_pass_batch(SAFE_DRAFTS)] == [True, True]
+        assert mock_response.call_count == 3
+
+    @patch("writer.writer._gemini_response")
+    def test_cache_keys_separate_single_and_batch(self, mock_response, writer_mod, monkeypatch, tmp_path):
+        """Verdicts cached by one prompt variant are not served to the other."""
+        monkeypatch.setattr(
+            writer_mod, "critic_cache", writer_mod.open_cache(str(tmp_path / "verdicts.db"))
         )
 
-        from writer.writer import critic_pass
+        mock_response.return_value = _reply(True)
+        writer_mod.critic_pass(SAFE_DRAFTS[0])
+        writer_mod.critic_pass(SAFE_DRAFTS[1])
+        assert mock_response.call_count == 2
 
-        is_safe, reason = critic_pass("Valid draft text")
-        assert is_safe
+        # Single-pass hits must not short-circuit the batch prompt
+        mock_response.return_value = MockGeminiResponse(json.dumps([
+            {"safe": True, "reason": ""}, {"safe": True, "reason": ""},
+        ]))
+        writer_mod.critic_pass_batch(SAFE_DRAFTS)
+        assert mock_response.call_count == 3
+        assert mock_response.call_args.kwargs["response_schema"] == list[writer_mod.CriticVerdict]
+
+        # ...while batch verdicts are reused by the next batch
+        writer_mod.critic_pass_batch(SAFE_DRAFTS)
+        assert mock_response.call_count == 3
 
 
 class TestCriticConstitution:
     """Test that the constitution prompt is properly structured."""
 
-    def test_constitution_covers_all_rules(self):
+    def test_constitution_covers_all_rules(self, writer_mod):
         """Constitution should mention all required safety rules."""
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        os.environ["NEWS_PATH"] = "/tmp/test_news.json"
-        os.environ["DRAFTS_PATH"] = "/tmp/test_drafts"
-        os.environ["RAG_PATH"] = "/tmp/test_rag.json"
-
-        from writer.writer import CONSTITUTION
-
         required_topics = [
             "financial",
             "political",
@@ -197,11 +325,11 @@ class TestCriticConstitution:
             "length",
         ]
 
-        constitution_lower = CONSTITUTION.lower()
-        for topic in required_topics:
-            assert topic in constitution_lower, (
-                f"Constitution missing '{topic}' check"
-            )
+        # One case-insensitive pass over the constitution for all topics
+        topics_re = re.compile("|".join(map(re.escape, required_topics)), re.I)
+        found = {m.lower() for m in topics_re.findall(writer_mod.CONSTITUTION)}
+        missing = set(required_topics) - found
+        assert not missing, f"Constitution missing checks: {sorted(missing)}"
 
 
 if __name__ == "__main__":
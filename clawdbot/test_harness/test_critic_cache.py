@@ -0,0 +1,205 @@
+"""
+ClawdBot Critic Cache Tests — Unit tests for the on-disk verdict memo.
+
+Exercises the SQLite-backed VerdictCache directly, and the curator's use
+of it through a fake Claude client (no model calls).
+"""
+
+import json
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from writer.critic_cache import VerdictCache, cache_key, open_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A fresh cache file per test."""
+    return VerdictCache(str(tmp_path / "verdicts.db"))
+
+
+class TestCacheKey:
+    """Test verdict cache key derivation."""
+
+    def test_stable_across_calls(self):
+        """The same inputs always hash to the same key."""
+        assert cache_key("prompt", "model", "draft") == cache_key("prompt", "model", "draft")
+
+    def test_known_value(self):
+        """Keys are stable across processes and releases (no salted hash())."""
+        assert cache_key("a", "b") == "852635742d6eb30fdccb0e7c1b53d92f"
+
+    def test_fixed_size(self):
+        """Keys are 128-bit hex digests whatever the input size."""
+        assert len(cache_key("x" * 100_000)) == 32
+
+    @pytest.mark.parametrize("a, b", [
+        (("prompt", "model", "draft"), ("prompt", "model", "draft!")),
+        (("prompt", "model", "draft"), ("prompt v2", "model", "draft")),
+        (("ab", "c"), ("a", "bc")),  # part boundaries matter
+        (("a", "b"), ("a", "b", "")),
+    ])
+    def test_different_inputs_differ(self, a, b):
+        """Changing any part (or where parts split) changes the key."""
+        assert cache_key(*a) != cache_key(*b)
+
+
+class TestVerdictCache:
+    """Test get/set round trips and persistence."""
+
+    def test_miss_returns_none(self, cache):
+        """Unknown keys are a miss."""
+        assert cache.get(cache_key("nothing")) is None
+
+    @pytest.mark.parametrize("value", [
+        [True, "Passed all constitutional checks"],
+        [False, "Contains profanity"],
+        {"approved": True, "score": 8, "category": "market_trends"},
+        "SAFE",
+    ])
+    def test_round_trip(self, cache, value):
+        """Stored JSON values come back equal."""
+        key = cache_key("prompt", "model", repr(value))
+        cache.set(key, value)
+        assert cache.get(key) == value
+
+    def test_overwrite(self, cache):
+        """Setting an existing key replaces its value."""
+        key = cache_key("k")
+        cache.set(key, [False, "first"])
+        cache.set(key, [True, "second"])
+        assert cache.get(key) == [True, "second"]
+
+    def test_persists_across_instances(self, tmp_path):
+        """A reopened cache file still holds earlier verdicts."""
+        path = str(tmp_path / "verdicts.db")
+        VerdictCache(path).set(cache_key("k"), [True, ""])
+        assert VerdictCache(path).get(cache_key("k")) == [True, ""]
+
+    def test_concurrent_get_set(self, cache):
+        """Threads sharing one cache neither error nor lose writes."""
+        errors = []
+
+        def worker(n: int):
+            try:
+                for i in range(20):
+                    key = cache_key(str(n), str(i))
+                    cache.set(key, [n, i])
+                    assert cache.get(key) == [n, i]
+            except Exception as e:  # surfaced below; asserts in threads are swallowed
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert all(
+            cache.get(cache_key(str(n), str(i))) == [n, i]
+            for n in range(4) for i in range(20)
+        )
+
+
+class TestOpenCache:
+    """Test cache construction from configuration."""
+
+    @pytest.mark.parametrize("path", [None, ""])
+    def test_disabled_without_path(self, path):
+        """No path means caching is off."""
+        assert open_cache(path) is None
+
+    def test_opens_writable_path(self, tmp_path):
+        """A writable path yields a working cache."""
+        cache = open_cache(str(tmp_path / "verdicts.db"))
+        assert isinstance(cache, VerdictCache)
+
+    def test_unopenable_path_disables(self, tmp_path):
+        """A path SQLite can't open disables caching instead of raising."""
+        assert open_cache(str(tmp_path / "missing-dir" / "verdicts.db")) is None
+
+
+class TestCuratorVerdictCache:
+    """Single-post and batched curator verdicts are cached separately."""
+
+    @pytest.fixture
+    def curator(self, curator_mod, cache, monkeypatch):
+        """The curator with a fresh cache and a fake client tagging each verdict's prompt."""
+        calls = []
+
+        def create(model, max_tokens, temperature, messages):
+            content = messages[0]["content"]
+            calls.append(content)
+            if "POSTS TO EVALUATE" in content:
+                ids = re.findall(r"(?m)^(\d+)\. Author: ", content)
+                verdicts = [
+                    {"id": int(n), "include": True, "quality_score": 7,
+                     "category": "general_insight", "reason": "batch"}
+                    for n in ids
+                ]
+            else:
+                verdicts = {"include": False, "quality_score": 3,
+                            "category": "general_insight", "reason": "single"}
+            return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(verdicts))])
+
+        monkeypatch.setattr(curator_mod, "client", SimpleNamespace(
+            messages=SimpleNamespace(create=create)))
+        monkeypatch.setattr(curator_mod, "verdict_cache", cache)
+        return curator_mod, calls
+
+    @staticmethod
+    def _posts(n: int) -> list[tuple[str, str]]:
+        return [(f"Insight number {i} about unit economics.", f"author{i}") for i in range(n)]
+
+    def test_single_and_batch_keep_own_verdicts(self, curator):
+        """A batch verdict never answers a one-post call on the same text, or vice versa."""
+        mod, calls = curator
+        posts = self._posts(3)
+
+        batch = mod.evaluate_posts_batch(posts)
+        single = mod.evaluate_post(*posts[0])
+        assert [v["reason"] for v in batch] == ["batch"] * 3
+        assert single["reason"] == "single"
+        assert len(calls) == 2
+
+        # Both variants are now cached and each still returns its own verdict
+        assert [v["reason"] for v in mod.evaluate_posts_batch(posts)] == ["batch"] * 3
+        assert mod.evaluate_post(*posts[0])["reason"] == "single"
+        assert len(calls) == 2
+
+    def test_batch_verdicts_drop_echoed_id(self, curator):
+        """The post number the model echoes isn't returned or cached."""
+        mod, _ = curator
+        posts = self._posts(2)
+
+        assert all("id" not in v for v in mod.evaluate_posts_batch(posts))
+        assert all("id" not in v for v in mod.evaluate_posts_batch(posts))
+
+    def test_concurrent_groups_then_single(self, curator):
+        """Groups judged on CURATOR_CONCURRENCY threads don't leak into single-post calls."""
+        mod, calls = curator
+        posts = self._posts(3 * mod.EVAL_GROUP_SIZE)
+        groups = [
+            posts[i:i + mod.EVAL_GROUP_SIZE] for i in range(0, len(posts), mod.EVAL_GROUP_SIZE)
+        ]
+
+        with ThreadPoolExecutor(max_workers=mod.CURATOR_CONCURRENCY) as pool:
+            batched = [v for group in pool.map(mod.evaluate_posts_batch, groups) for v in group]
+        assert [v["reason"] for v in batched] == ["batch"] * len(posts)
+        assert len(calls) == len(groups)
+
+        assert all(mod.evaluate_post(*post)["reason"] == "single" for post in posts)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+ClawdBot JSON I/O Tests — The per-package _jsonio copies and their helpers.
+
+Each container ships its own copy of _jsonio.py; these tests keep the
+three byte-identical and check the shared read/write behaviour once.
+"""
+
+import datetime
+import os
+import stat
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from writer import _jsonio
+
+ROOT = Path(__file__).parent.parent
+COPIES = [ROOT / pkg / "_jsonio.py" for pkg in ("scraper", "writer", "publisher")]
+
+
+def test_copies_identical():
+    """scraper/, writer/ and publisher/ ship the same _jsonio.py."""
+    reference = COPIES[0].read_bytes()
+    differing = [str(p.relative_to(ROOT)) for p in COPIES[1:] if p.read_bytes() != reference]
+    assert not differing, f"{', '.join(differing)} differ from scraper/_jsonio.py"
+
+
+class TestDumps:
+    """Test serialization formats."""
+
+    DATA = {"text": "Café ☕", "n": [1, 2]}
+
+    def test_indented_by_default(self):
+        """The default output is 2-space indented."""
+        assert _jsonio.dumps(self.DATA).startswith(b'{\n  "text"')
+
+    def test_compact(self):
+        """indent=False drops all whitespace."""
+        assert b" " not in _jsonio.dumps({"n": [1, 2]}, indent=False)
+
+    @pytest.mark.parametrize("indent", [True, False])
+    def test_round_trip_utf8(self, indent):
+        """Non-ASCII text is written as UTF-8 and parses back unchanged."""
+        raw = _jsonio.dumps(self.DATA, indent)
+        assert "Café ☕".encode() in raw
+        assert _jsonio.loads(raw) == self.DATA
+
+    def test_unencodable_values_stringified(self):
+        """Values JSON can't encode are str()'d rather than raising."""
+        when = datetime.date(2026, 2, 12)
+        assert _jsonio.loads(_jsonio.dumps({"when": when})) == {"when": "2026-02-12"}
+
+
+class TestWriteJson:
+    """Test atomic file writes."""
+
+    def test_round_trip(self, tmp_path):
+        """Written files read back equal."""
+        path = tmp_path / "draft.json"
+        _jsonio.write_json(path, {"text": "hello"}, indent=False)
+        assert _jsonio.read_json(path) == {"text": "hello"}
+
+    def test_world_readable(self, tmp_path):
+        """Files are 0644 like a plain open(), not mkstemp's 0600."""
+        path = tmp_path / "draft.json"
+        _jsonio.write_json(path, {})
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+    def test_failed_write_keeps_original(self, tmp_path):
+        """A failed replace leaves the old file and no temp file behind."""
+        path = tmp_path / "draft.json"
+        _jsonio.write_json(path, {"v": 1})
+        with patch.object(_jsonio.os, "replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                _jsonio.write_json(path, {"v": 2})
+        assert _jsonio.read_json(path) == {"v": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["draft.json"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,78 @@
+"""
+ClawdBot Scraper Tests — Unit tests for feed fetching.
+
+Feeds are served from canned requests responses through a patched
+session (no real HTTP calls).
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _response(body: bytes, headers: dict) -> requests.Response:
+    """A real requests.Response, so headers are a CaseInsensitiveDict."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers.update(headers)
+    return resp
+
+
+LATIN1_FEED = (
+    '<?xml version="1.0"?>\n'
+    "<rss version=\"2.0\"><channel><title>Café News</title>"
+    "<item><title>Série A für Café-Startup</title>"
+    "<link>https://example.com/cafe</link>"
+    "<description>Déjà vu</description></item>"
+    "</channel></rss>"
+).encode("latin-1")
+
+
+# Not valid UTF-8 and not windows-1252 either, so feedparser's fallbacks
+# can't guess it; only the header charset decodes it correctly
+KOI8_FEED = (
+    '<?xml version="1.0"?>\n'
+    "<rss version=\"2.0\"><channel><title>Новости</title>"
+    "<item><title>Привет, венчур</title>"
+    "<link>https://example.com/ru</link>"
+    "<description>Раунд A</description></item>"
+    "</channel></rss>"
+).encode("koi8-r")
+
+
+class TestFetchFeed:
+    """Test RSS fetching and decoding."""
+
+    def test_charset_from_content_type_header(self, scraper_mod):
+        """A charset declared only in the HTTP header must be honoured."""
+        resp = _response(LATIN1_FEED, {"Content-Type": "application/rss+xml; charset=ISO-8859-1"})
+
+        with patch.object(scraper_mod.SESSION, "get", return_value=resp):
+            articles = scraper_mod._fetch_feed({"name": "Test", "url": "https://example.com/rss"})
+
+        assert len(articles) == 1
+        assert articles[0]["title"] == "Série A für Café-Startup"
+        assert articles[0]["description"] == "Déjà vu"
+        assert articles[0]["url"] == "https://example.com/cafe"
+
+    def test_non_latin_charset_from_content_type_header(self, scraper_mod):
+        """Header charsets that can't be guessed from the bytes still decode."""
+        resp = _response(KOI8_FEED, {"Content-Type": "application/rss+xml; charset=KOI8-R"})
+
+        with patch.object(scraper_mod.SESSION, "get", return_value=resp):
+            articles = scraper_mod._fetch_feed({"name": "Test", "url": "https://example.com/rss"})
+
+        assert articles[0]["title"] == "Привет, венчур"
+        assert articles[0]["description"] == "Раунд A"
+
+    def test_missing_url_returns_empty(self, scraper_mod):
+        """A feed without a URL is skipped without a request."""
+        with patch.object(scraper_mod.SESSION, "get") as get:
+            assert scraper_mod._fetch_feed({"name": "Empty"}) == []
+        get.assert_not_called()
@@ -6,13 +6,12 @@ using mocked Anthropic client (no real API calls).
 """
 
 import json
-import os
 import sys
 import pytest
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -76,41 +75,32 @@ def work_dir():
 class TestWriterPromptBuilding:
     """Test prompt construction logic."""
 
-    def test_build_generation_prompt_with_examples(self, work_dir):
+    def test_build_generation_prompt_with_examples(self, work_dir, writer_mod, monkeypatch):
         """Prompt should include news and RAG examples."""
-        os.environ["NEWS_PATH"] = str(work_dir / "news" / "latest.json")
-        os.environ["RAG_PATH"] = str(work_dir / "rag" / "vc_corpus.json")
-        os.environ["DRAFTS_PATH"] = str(work_dir / "drafts")
-        os.environ["CLAWDBOT_LOCAL_TEST"] = "1"
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
+        monkeypatch.setattr(writer_mod, "NEWS_PATH", work_dir / "news" / "latest.json")
+        monkeypatch.setattr(writer_mod, "RAG_PATH", work_dir / "rag" / "vc_corpus.json")
+        monkeypatch.setattr(writer_mod, "DRAFTS_PATH", work_dir / "drafts")
 
-        # Import after setting env vars
-        from writer.writer import build_generation_prompt, load_news, load_rag_examples
+        news = writer_mod.load_news()
+        examples = writer_mod.load_rag_examples(n=2)
 
-        news = load_news()
-        examples = load_rag_examples(n=2)
-
-        prompt = build_generation_prompt(news, examples)
+        prompt = writer_mod.build_generation_prompt(news, examples)
 
         assert "TODAY'S NEWS:" in prompt
         assert "STYLE EXAMPLES" in prompt
         assert "Z5 Capital" in prompt
         assert "LinkedIn" in prompt
 
-    def test_build_prompt_without_examples(self, work_dir):
+    def test_build_prompt_without_examples(self, work_dir, writer_mod, monkeypatch):
         """Prompt should have fallback when no RAG examples available."""
-        os.environ["NEWS_PATH"] = str(work_dir / "news" / "latest.json")
-        os.environ["RAG_PATH"] = str(work_dir / "nonexistent.json")
-        os.environ["DRAFTS_PATH"] = str(work_dir / "drafts")
-        os.environ["CLAWDBOT_LOCAL_TEST"] = "1"
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-
-        from writer.writer import build_generation_prompt, load_news, load_rag_examples
+        monkeypatch.setattr(writer_mod, "NEWS_PATH", work_dir / "news" / "latest.json")
+        monkeypatch.setattr(writer_mod, "RAG_PATH", work_dir / "nonexistent.json")
+        monkeypatch.setattr(writer_mod, "DRAFTS_PATH", work_dir / "drafts")
 
-        news = load_news()
-        examples = load_rag_examples(n=5)
+        news = writer_mod.load_news()
+        examples = writer_mod.load_rag_examples(n=5)
 
-        prompt = build_generation_prompt(news, examples)
+        prompt = writer_mod.build_generation_prompt(news, examples)
 
         assert "No examples available" in prompt or "STYLE EXAMPLES" in prompt
 
@@ -125,7 +115,7 @@ class TestDraftSaving:
         # Create a mock draft
         draft_data = {
             "text": "This is a test draft about AI trends.",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "draft_id": "abc123",
             "word_count": 8,
             "news_source": "https://example.com",
@@ -160,31 +150,96 @@ class TestDraftSaving:
 class TestRAGLoading:
     """Test RAG corpus loading."""
 
-    def test_load_rag_examples(self, work_dir):
+    def test_load_rag_examples(self, work_dir, writer_mod, monkeypatch):
         """Should load and randomly sample from corpus."""
-        os.environ["RAG_PATH"] = str(work_dir / "rag" / "vc_corpus.json")
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        os.environ["NEWS_PATH"] = str(work_dir / "news" / "latest.json")
-        os.environ["DRAFTS_PATH"] = str(work_dir / "drafts")
-
-        from writer.writer import load_rag_examples
+        monkeypatch.setattr(writer_mod, "RAG_PATH", work_dir / "rag" / "vc_corpus.json")
+        monkeypatch.setattr(writer_mod, "NEWS_PATH", work_dir / "news" / "latest.json")
+        monkeypatch.setattr(writer_mod, "DRAFTS_PATH", work_dir / "drafts")
 
-        examples = load_rag_examples(n=2)
+        examples = writer_mod.load_rag_examples(n=2)
         assert len(examples) == 2
         assert all("text" in ex for ex in examples)
 
-    def test_load_rag_missing_file(self, work_dir):
+    def test_load_rag_missing_file(self, work_dir, writer_mod, monkeypatch):
         """Should return empty list when corpus is missing."""
-        os.environ["RAG_PATH"] = str(work_dir / "nonexistent.json")
-        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-REDACTED"
-        os.environ["NEWS_PATH"] = str(work_dir / "news" / "latest.json")
-        os.environ["DRAFTS_PATH"] = str(work_dir / "drafts")
+        monkeypatch.setattr(writer_mod, "RAG_PATH", work_dir / "nonexistent.json")
+        monkeypatch.setattr(writer_mod, "NEWS_PATH", work_dir / "news" / "latest.json")
+        monkeypatch.setattr(writer_mod, "DRAFTS_PATH", work_dir / "drafts")
 
-        from writer.writer import load_rag_examples
-
-        examples = load_rag_examples(n=5)
+        examples = writer_mod.load_rag_examples(n=5)
         assert examples == []
 
+    def test_mutating_results_leaves_cache_intact(self, work_dir, writer_mod, monkeypatch):
+        """Loaded news and examples are copies; editing them can't corrupt later loads."""
+        monkeypatch.setattr(writer_mod, "RAG_PATH", work_dir / "rag" / "vc_corpus.json")
+        monkeypatch.setattr(writer_mod, "NEWS_PATH", work_dir / "news" / "latest.json")
+
+        news = writer_mod.load_news()
+        news["articles"].clear()
+        news.pop("summary")
+        for ex in writer_mod.load_rag_examples(n=2):
+            ex["text"] = "overwritten"
+
+        assert writer_mod.load_news()["articles"][0]["url"] == "https://example.com/article"
+        assert "summary" in writer_mod.load_news()
+        assert all(ex["text"] != "overwritten" for ex in writer_mod.load_rag_examples(n=2))
+
+
+class TestContextCache:
+    """Test serving static system prompts from Gemini context caches."""
+
+    @pytest.fixture
+    def gemini(self, writer_mod, monkeypatch):
+        """Fresh cache state, a mock inline model and a mock CachedContent.create."""
+        monkeypatch.setattr(writer_mod, "_cached_models", {})
+        monkeypatch.setattr(writer_mod, "_context_cache_disabled", False)
+        inline = MagicMock()
+        cached = MagicMock()
+        create = MagicMock(return_value=MagicMock(name="cache"))
+        monkeypatch.setattr(writer_mod, "_model", inline)
+        monkeypatch.setattr(writer_mod.caching.CachedContent, "create", create)
+        monkeypatch.setattr(
+            writer_mod.genai.GenerativeModel, "from_cached_content", MagicMock(return_value=cached)
+        )
+        return inline, cached, create
+
+    def test_current_prompts_sent_inline(self, writer_mod, gemini):
+        """Both static prompts are below the explicit-cache minimum today."""
+        inline, cached, create = gemini
+        for system_prompt in (writer_mod.CONSTITUTION, writer_mod.GENERATION_PREFIX):
+            writer_mod._gemini_response("body", 0.0, 10, system_prompt)
+            sent = inline.generate_content.call_args.args[0]
+            assert sent == f"{system_prompt}\n\nbody"
+        create.assert_not_called()
+        cached.generate_content.assert_not_called()
+
+    def test_large_prompt_served_from_cache(self, writer_mod, gemini, monkeypatch):
+        """A prompt over the threshold is cached once and not resent inline."""
+        inline, cached, create = gemini
+        monkeypatch.setattr(writer_mod, "CONTEXT_CACHE_MIN_TOKENS", 1)
+
+        for _ in range(2):
+            writer_mod._gemini_response("body", 0.0, 10, "system")
+
+        create.assert_called_once()
+        assert create.call_args.kwargs["system_instruction"] == "system"
+        assert cached.generate_content.call_count == 2
+        assert cached.generate_content.call_args.args[0] == "body"
+        inline.generate_content.assert_not_called()
+
+    def test_create_failure_disables_caching(self, writer_mod, gemini, monkeypatch):
+        """A refused cache falls back inline and isn't retried for other prompts."""
+        inline, cached, create = gemini
+        monkeypatch.setattr(writer_mod, "CONTEXT_CACHE_MIN_TOKENS", 1)
+        create.side_effect = RuntimeError("caching not supported")
+
+        writer_mod._gemini_response("body", 0.0, 10, "system")
+        writer_mod._gemini_response("body", 0.0, 10, "other system")
+
+        create.assert_called_once()
+        assert inline.generate_content.call_args.args[0] == "other system\n\nbody"
+        cached.generate_content.assert_not_called()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -10,13 +10,34 @@ Usage:
 
 import json
 import os
+import re
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
-from anthropic import Anthropic
+from anthropic import Anthropic, DefaultHttpxClient
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import h2  # HTTP/2 support for httpx
+except ImportError:
+    h2 = None
+
+try:
+    from critic_cache import open_cache, cache_key
+    from _jsonio import dumps, loads
+except ImportError:  # imported as writer.auto_curate
+    from writer.critic_cache import open_cache, cache_key
+    from writer._jsonio import dumps, loads
 
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
@@ -32,20 +53,32 @@ if not ANTHROPIC_KEY or len(ANTHROPIC_KEY) < 20:
     log.error("ANTHROPIC_API_KEY not set or invalid")
     sys.exit(1)
 
-client = Anthropic(api_key=ANTHROPIC_KEY)
+# One client for the whole run, shared by the evaluation threads. With h2
+# installed its requests are multiplexed over a single HTTP/2 connection;
+# DefaultHttpxClient keeps the SDK's own pool limits and timeouts.
+client = Anthropic(
+    api_key=ANTHROPIC_KEY,
+    http_client=DefaultHttpxClient(http2=h2 is not None),
+)
 MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
-# ── Quality Assessment Prompt ────────────────────────
-QUALITY_PROMPT = """You are evaluating whether a social media post from a VC/tech 
-leader is high-quality enough to include in a training corpus for a social
-media content generator.
+# Evaluations run at temperature 0; set CRITIC_CACHE_PATH to reuse them
+# across re-curation runs
+verdict_cache = open_cache(os.getenv("CRITIC_CACHE_PATH", ""))
 
-CRITERIA for inclusion:
+# ── Quality Assessment Prompt ────────────────────────
+QUALITY_CRITERIA = """CRITERIA for inclusion:
 1. Provides actionable advice, market analysis, or genuine insight
 2. Is NOT promotional or self-congratulatory ("I'm excited to announce...")
 3. Has professional, measured tone (not hyperbolic)
 4. Would inspire a thoughtful LinkedIn post if used as a style reference
-5. Contains original thinking, not just links or retweets
+5. Contains original thinking, not just links or retweets"""
+
+QUALITY_PROMPT = """You are evaluating whether a social media post from a VC/tech 
+leader is high-quality enough to include in a training corpus for a social
+media content generator.
+
+""" + QUALITY_CRITERIA + """
 
 POST TO EVALUATE:
 Author: {author}
@@ -59,12 +92,100 @@ Respond in EXACTLY this JSON format (no other text):
   "reason": "one sentence explanation"
 }}"""
 
+# Several posts are judged in one request; the model answers with one
+# object per post, keyed by its number in the list
+EVAL_GROUP_SIZE = int(os.getenv("CURATOR_GROUP_SIZE", "10"))
+# Groups evaluated concurrently; the SDK backs off on 429s by itself
+CURATOR_CONCURRENCY = int(os.getenv("CURATOR_CONCURRENCY", "8"))
+
+BATCH_QUALITY_PROMPT = """You are evaluating whether each of the following social media posts
+from VC/tech leaders is high-quality enough to include in a training corpus
+for a social media content generator. Judge every post independently.
+
+""" + QUALITY_CRITERIA + """
+
+POSTS TO EVALUATE:
+{posts}
+
+Respond with EXACTLY a JSON array containing one object per post, in order
+(no other text):
+[
+  {{
+    "id": <post number>,
+    "include": true/false,
+    "quality_score": 1-10,
+    "category": "founder_advice" | "market_trends" | "tech_analysis" | "fundraising" | "leadership" | "general_insight",
+    "reason": "one sentence explanation"
+  }}
+]"""
+
+
+# The templates are split around their fields once, so building a prompt
+# is plain concatenation rather than a str.format parse per call
+_PROMPT_HEAD, _rest = QUALITY_PROMPT.split("{author}")
+_PROMPT_MID, _PROMPT_TAIL = _rest.split("{text}")
+_PROMPT_TAIL = _PROMPT_TAIL.replace("{{", "{").replace("}}", "}")
+_BATCH_HEAD, _BATCH_TAIL = BATCH_QUALITY_PROMPT.split("{posts}")
+_BATCH_TAIL = _BATCH_TAIL.replace("{{", "{").replace("}}", "}")
+del _rest
+
+# Posts the criteria reject outright are turned away locally instead of
+# spending a Claude call on them. Only unambiguous cases qualify: a
+# leading "RT @" (a retweet, as in the scraper's _passes_quality) and bare
+# links. Promotional phrases still go to Claude, since a post may quote or
+# criticise "excited to announce" rather than use it.
+_REJECT_RE = re.compile(r"^RT @|^https?://\S+$")
+_URL_RE = re.compile(r"https?://\S+")
+PREFILTER_REJECTION = {
+    "include": False,
+    "quality_score": 0,
+    "category": "general_insight",
+    "reason": "regex prefilter",
+}
+
+
+def _prefilter(text: str) -> Optional[dict]:
+    """Return a rejection for trivially unsuitable posts, else None."""
+    text = text.strip()
+    if _REJECT_RE.search(text):
+        return dict(PREFILTER_REJECTION)
+    if sum(map(len, _URL_RE.findall(text))) > 0.9 * len(text):
+        return dict(PREFILTER_REJECTION)
+    return None
+
+
+def _parse_json_response(result_text: str):
+    """Parse a JSON reply, tolerating a markdown code fence around it."""
+    result_text = result_text.strip()
+    if result_text.startswith("```"):
+        result_text = result_text.split("```", 2)[1].removeprefix("json")
+    return loads(result_text)
+
+
+def _eval_key(text: str, author: str, prompt: str = QUALITY_PROMPT) -> str:
+    """
+    Cache key for one post's evaluation under prompt and the current model.
+
+    Single-post and batched verdicts come from different prompts, so each
+    is cached under its own template and one never answers for the other.
+    """
+    return cache_key(prompt, MODEL, author, text)
+
 
 def evaluate_post(text: str, author: str) -> Optional[dict]:
     """
     Use Claude to evaluate quality of a single post.
     Returns evaluation dict or None on failure.
     """
+    rejection = _prefilter(text)
+    if rejection:
+        return rejection
+
+    if verdict_cache:
+        cached = verdict_cache.get(_eval_key(text, author))
+        if cached is not None:
+            return cached
+
     try:
         response = client.messages.create(
             model=MODEL,
@@ -73,21 +194,12 @@ def evaluate_post(text: str, author: str) -> Optional[dict]:
             messages=[
                 {
                     "role": "user",
-                    "content": QUALITY_PROMPT.format(author=author, text=text),
+                    "content": f"{_PROMPT_HEAD}{author}{_PROMPT_MID}{text}{_PROMPT_TAIL}",
                 }
             ],
         )
 
-        result_text = response.content[0].text.strip()
-
-        # Parse JSON response
-        # Handle potential markdown code blocks
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        return json.loads(result_text)
+        evaluation = _parse_json_response(response.content[0].text)
 
     except (json.JSONDecodeError, IndexError) as e:
         log.warning(f"Failed to parse Claude response for @{author}: {e}")
@@ -96,6 +208,141 @@ def evaluate_post(text: str, author: str) -> Optional[dict]:
         log.error(f"Claude API error: {e}")
         return None
 
+    if verdict_cache and isinstance(evaluation, dict):
+        verdict_cache.set(_eval_key(text, author), evaluation)
+    return evaluation
+
+
+def evaluate_posts_batch(posts: list[tuple[str, str]]) -> list[Optional[dict]]:
+    """
+    Use Claude to evaluate several (text, author) posts in one request.
+
+    Returns one evaluation dict (or None) per post, in input order. Posts
+    the prefilter rejects and posts with cached evaluations are resolved
+    locally, and only the rest are sent. If the batched reply can't be
+    parsed, or leaves a post out, those posts are evaluated one at a time
+    with evaluate_post instead.
+    """
+    results = [
+        _prefilter(text)
+        or (
+            verdict_cache.get(_eval_key(text, author, BATCH_QUALITY_PROMPT))
+            if verdict_cache else None
+        )
+        for text, author in posts
+    ]
+    misses = [i for i, r in enumerate(results) if r is None]
+
+    if len(misses) == 1:
+        results[misses[0]] = evaluate_post(*posts[misses[0]])
+    elif misses:
+        fresh = _evaluate_batch_uncached([posts[i] for i in misses])
+        for i, evaluation in zip(misses, fresh):
+            results[i] = evaluation
+    return results
+
+
+def _evaluate_batch_uncached(posts: list[tuple[str, str]]) -> list[Optional[dict]]:
+    """One batched Claude call for posts not in the cache (see evaluate_posts_batch)."""
+    listing = "\n\n".join(
+        f"{n}. Author: {author}\n   Text: {text}"
+        for n, (text, author) in enumerate(posts, 1)
+    )
+    by_id = {}
+    try:
+        response = client.messages.create(
+            model=MODEL,
+            max_tokens=200 * len(posts),
+            temperature=0,
+            messages=[
+                {
+                    "role": "user",
+                    "content": _BATCH_HEAD + listing + _BATCH_TAIL,
+                }
+            ],
+        )
+        results = _parse_json_response(response.content[0].text)
+        # The echoed "id" only places a verdict in this listing; drop it so
+        # batched verdicts have the same shape as single-post ones
+        by_id = {
+            int(r.pop("id", 0)): r for r in results if isinstance(r, dict)
+        }
+    except (ValueError, IndexError, TypeError, AttributeError) as e:
+        log.warning(f"Failed to parse batched Claude response: {e} — evaluating individually")
+    except Exception as e:
+        log.error(f"Claude API error: {e} — evaluating individually")
+
+    if verdict_cache:
+        for n, (text, author) in enumerate(posts, 1):
+            if n in by_id:
+                verdict_cache.set(_eval_key(text, author, BATCH_QUALITY_PROMPT), by_id[n])
+
+    return [
+        by_id[n] if n in by_id else evaluate_post(text, author)
+        for n, (text, author) in enumerate(posts, 1)
+    ]
+
+
+def _chunks(items: list, size: int):
+    """Yield successive lists of at most size items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _load_posts(input_path: Path, limit: int) -> list[dict]:
+    """
+    Read at most limit posts from a raw array or {examples: []} file.
+
+    With ijson installed the posts are streamed, so only the first limit
+    are ever parsed; otherwise the whole file is loaded.
+    """
+    if ijson:
+        with open(input_path, "rb") as f:
+            head = f.read(64).lstrip()[:1]
+            f.seek(0)
+            prefix = {b"[": "item", b"{": "examples.item"}.get(head)
+            if prefix:
+                posts = list(islice(ijson.items(f, prefix, use_float=True), limit))
+                # An object with no examples falls through to the format check
+                if posts or head == b"[":
+                    return posts
+
+    with open(input_path) as f:
+        raw_data = json.load(f)
+
+    # Handle both array format and corpus format
+    if isinstance(raw_data, list):
+        posts = raw_data
+    elif isinstance(raw_data, dict) and "examples" in raw_data:
+        posts = raw_data["examples"]
+    else:
+        log.error("Unrecognized input format. Expected array or {examples: []}")
+        sys.exit(1)
+    return posts[:limit]
+
+
+def _write_corpus(output_path: Path, header: dict, examples: list[dict]):
+    """
+    Write {**header, "examples": examples} as indented JSON.
+
+    Examples are serialized and written one at a time, so the full document
+    is never built in memory as a single string. The bytes match a one-shot
+    dump with indent=2.
+    """
+    with open(output_path, "wb") as f:
+        f.write(dumps(header)[:-2])  # drop the closing "\n}"
+        if not examples:
+            f.write(b',\n  "examples": []\n}')
+            return
+        f.write(b',\n  "examples": [')
+        sep = b"\n    "
+        for ex in examples:
+            f.write(sep)
+            f.write(dumps(ex).replace(b"\n", b"\n    "))
+            sep = b",\n    "
+        f.write(b"\n  ]\n}")
+
 
 def curate_corpus(
     input_path: Path,
@@ -112,25 +359,18 @@ def curate_corpus(
         min_quality: Minimum quality_score for inclusion (1-10)
         batch_size: Number of posts to process (for API cost control)
     """
-    # Load raw data
-    with open(input_path) as f:
-        raw_data = json.load(f)
-
-    # Handle both array format and corpus format
-    if isinstance(raw_data, list):
-        posts = raw_data
-    elif isinstance(raw_data, dict) and "examples" in raw_data:
-        posts = raw_data["examples"]
-    else:
-        log.error("Unrecognized input format. Expected array or {examples: []}")
-        sys.exit(1)
+    # Load raw data (only the first batch_size posts are needed)
+    posts = _load_posts(input_path, batch_size)
 
     log.info(f"Loaded {len(posts)} posts to evaluate")
     log.info(f"Processing first {batch_size} posts (min quality: {min_quality})")
 
     accepted = []
+    categories: set[str] = set()
     rejected = 0
+    total = min(batch_size, len(posts))
 
+    candidates = []
     for i, post in enumerate(posts[:batch_size]):
         text = post.get("text", post.get("full_text", ""))
         author = post.get("author", post.get("handle", "unknown"))
@@ -139,40 +379,49 @@ def curate_corpus(
             rejected += 1
             continue
 
-        log.info(f"  [{i+1}/{min(batch_size, len(posts))}] Evaluating @{author}...")
-
-        evaluation = evaluate_post(text, author)
-
-        if evaluation and evaluation.get("include") and evaluation.get("quality_score", 0) >= min_quality:
-            accepted.append({
-                "text": text,
-                "author": author,
-                "author_name": post.get("author_name", ""),
-                "platform": post.get("platform", "twitter"),
-                "engagement": post.get("engagement", 0),
-                "category": evaluation["category"],
-                "quality_score": evaluation["quality_score"],
-            })
-            log.info(f"    ✅ Accepted (score: {evaluation['quality_score']}, "
-                     f"category: {evaluation['category']})")
-        else:
-            rejected += 1
-            reason = evaluation.get("reason", "did not meet criteria") if evaluation else "evaluation failed"
-            log.info(f"    ❌ Rejected: {reason}")
+        candidates.append((i, post, text, author))
+
+    def evaluate_group(group):
+        log.info(f"  [{group[0][0]+1}-{group[-1][0]+1}/{total}] Evaluating {len(group)} posts...")
+        return evaluate_posts_batch([(text, author) for _, _, text, author in group])
+
+    # Groups are evaluated concurrently; map() keeps results in input order
+    groups = list(_chunks(candidates, EVAL_GROUP_SIZE))
+    with ThreadPoolExecutor(max_workers=CURATOR_CONCURRENCY) as pool:
+        results = list(pool.map(evaluate_group, groups))
+
+    for group, evaluations in zip(groups, results):
+        for (i, post, text, author), evaluation in zip(group, evaluations):
+            if evaluation and evaluation.get("include") and evaluation.get("quality_score", 0) >= min_quality:
+                accepted.append({
+                    "text": text,
+                    "author": author,
+                    "author_name": post.get("author_name", ""),
+                    "platform": post.get("platform", "twitter"),
+                    "engagement": post.get("engagement", 0),
+                    "category": evaluation["category"],
+                    "quality_score": evaluation["quality_score"],
+                })
+                categories.add(evaluation["category"])
+                log.info(f"    ✅ @{author} accepted (score: {evaluation['quality_score']}, "
+                         f"category: {evaluation['category']})")
+            else:
+                rejected += 1
+                reason = evaluation.get("reason", "did not meet criteria") if evaluation else "evaluation failed"
+                log.info(f"    ❌ @{author} rejected: {reason}")
 
     # Build output corpus
-    corpus = {
+    header = {
         "version": "1.0",
         "curated": True,
         "total_examples": len(accepted),
-        "categories": list(set(ex["category"] for ex in accepted)),
-        "examples": sorted(accepted, key=lambda x: x["quality_score"], reverse=True),
+        "categories": sorted(categories),
     }
+    examples = sorted(accepted, key=itemgetter("quality_score"), reverse=True)
 
     # Write output
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(corpus, f, indent=2)
+    _write_corpus(output_path, header, examples)
 
     log.info(f"\n{'='*50}")
     log.info(f"Curation complete:")
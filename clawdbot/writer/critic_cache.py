@@ -0,0 +1,79 @@
+"""
+ClawdBot Critic Cache — On-disk memo of deterministic model verdicts.
+
+The constitutional critic and the corpus curator both call their model at
+temperature 0, so the same input always earns the same verdict. This
+module stores those verdicts in a small SQLite table, keyed by a BLAKE2b
+hash of everything that went into the request (prompt text, model, input),
+so reruns and repeated test passes skip the network round trip entirely.
+
+Editing a prompt changes the hash, which invalidates old entries on its own.
+
+Usage:
+    from critic_cache import open_cache, cache_key
+
+    cache = open_cache(os.getenv("CRITIC_CACHE_PATH", ""))
+    key = cache_key(CONSTITUTION, MODEL, draft_text)
+    if cache and (hit := cache.get(key)) is not None:
+        ...
+"""
+
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Optional
+
+log = logging.getLogger("critic_cache")
+
+
+def cache_key(*parts: str) -> str:
+    """Hash the request inputs into a fixed-size cache key."""
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class VerdictCache:
+    """Thread-safe key → JSON value store backed by one SQLite file."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts "
+                "(hash TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM verdicts WHERE hash = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (hash, value, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(value), int(time.time())),
+            )
+
+
+def open_cache(path: str) -> Optional[VerdictCache]:
+    """
+    Open the cache at path, or return None when caching is disabled.
+
+    An empty path disables caching. A path that can't be opened (e.g. on
+    the Writer's read-only filesystem) logs a warning and also disables it.
+    """
+    if not path:
+        return None
+    try:
+        return VerdictCache(path)
+    except sqlite3.Error as e:
+        log.warning(f"Verdict cache disabled — could not open {path}: {e}")
+        return None
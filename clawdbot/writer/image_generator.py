@@ -12,18 +12,29 @@ Templates:
 Usage:
     from image_generator import generate_post_image
     path = generate_post_image(draft_text, template="data_drop")
+    paths = generate_post_images([{"draft_text": text, "draft_id": "abc"}])
 """
 
-import json
 import os
+import re
 import sys
+import uuid
+import string
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 import google.generativeai as genai
 
+try:
+    from _jsonio import read_json, write_json
+except ImportError:  # imported as writer.image_generator
+    from writer._jsonio import read_json, write_json
+
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -89,31 +100,89 @@ LAYOUT ({orientation}):
 STYLE: Card-style layout. Clean, professional. Gradient accent border only — no gradient on text. Premium VC firm look."""
 
 
-def classify_template(draft_text: str) -> str:
-    """
-    Auto-classify which Z5 template to use based on post content.
+def _compile_template(template: str) -> tuple[tuple[str, Optional[str]], ...]:
+    """Parse a str.format template once into (literal, field name) pairs."""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in template field {field!r}")
+        parts.append((literal, field))
+    return tuple(parts)
 
-    Returns: 'data_drop', 'thought_leader', or 'milestone'
+
+def _fill(parts: tuple[tuple[str, Optional[str]], ...], **fields: str) -> str:
+    """Render compiled template parts; same result as template.format(**fields)."""
+    return "".join([
+        literal + fields[field] if field is not None else literal
+        for literal, field in parts
+    ])
+
+
+# Templates are parsed once here rather than by str.format on every render
+_DATA_DROP_PARTS = _compile_template(TEMPLATE_DATA_DROP)
+_THOUGHT_LEADER_PARTS = _compile_template(TEMPLATE_THOUGHT_LEADER)
+_MILESTONE_PARTS = _compile_template(TEMPLATE_MILESTONE)
+
+
+# ── Keyword Classification ──────────────────────────
+# Data indicators
+DATA_KEYWORDS = (
+    '$', 'billion', 'million', '%', 'record', 'funding', 'raised',
+    'growth', 'revenue', 'valuation', 'ratio', 'trend', 'chart',
+    'data', 'statistics', 'report', 'quarter', 'q1', 'q2', 'q3', 'q4',
+    'yoy', 'year-over-year',
+)
+
+# Milestone indicators
+MILESTONE_KEYWORDS = (
+    'welcome', 'announce', 'join', 'hired', 'launch', 'closed',
+    'partnership', 'acquisition', 'ipo', 'series', 'seed round',
+    'promotion', 'new hire',
+)
+
+# News sources credited on the graphic, in display order
+SOURCES = (
+    "TechCrunch", "Bloomberg", "Reuters", "The Information", "Forbes",
+    "WSJ", "Financial Times", "Crunchbase", "PitchBook",
+)
+
+# Lowercase scan key → display name, in display order
+_SOURCE_NAMES = {src.lower(): src for src in SOURCES}
+
+_KEYWORD_KIND = {
+    **{kw: "data" for kw in DATA_KEYWORDS},
+    **{kw: "milestone" for kw in MILESTONE_KEYWORDS},
+    **{key: "source" for key in _SOURCE_NAMES},
+}
+
+
+def _keyword_pattern(kw: str) -> str:
     """
-    text_lower = draft_text.lower()
-
-    # Data indicators
-    data_keywords = [
-        '$', 'billion', 'million', '%', 'record', 'funding', 'raised',
-        'growth', 'revenue', 'valuation', 'ratio', 'trend', 'chart',
-        'data', 'statistics', 'report', 'quarter', 'q1', 'q2', 'q3', 'q4',
-        'yoy', 'year-over-year',
-    ]
-
-    # Milestone indicators
-    milestone_keywords = [
-        'welcome', 'announce', 'join', 'hired', 'launch', 'closed',
-        'partnership', 'acquisition', 'ipo', 'series', 'seed round',
-        'promotion', 'new hire',
-    ]
-
-    data_score = sum(1 for kw in data_keywords if kw in text_lower)
-    milestone_score = sum(1 for kw in milestone_keywords if kw in text_lower)
+    A keyword that starts a word must not match mid-word ("ratio" in
+    "generation", "ipo" in "bipolar"). Only the start is anchored, so stems
+    still count ("announced", "launches"); symbols like $ and % match anywhere.
+    """
+    return (r"(?<!\w)" if re.match(r"\w", kw) else "") + re.escape(kw)
+
+
+# A lookahead alternation matches at every position, so one pass finds all
+# keywords, overlapping ones included (no keyword is a prefix of another)
+_KEYWORD_RE = re.compile(
+    "(?=("
+    + "|".join(map(_keyword_pattern, sorted(_KEYWORD_KIND, key=len, reverse=True)))
+    + "))"
+)
+
+
+def _scan_keywords(draft_text: str) -> frozenset[str]:
+    """The distinct (lowercase) keywords and sources present in the text."""
+    return frozenset(m.group(1) for m in _KEYWORD_RE.finditer(draft_text.lower()))
+
+
+def _classify_keywords(found: frozenset[str]) -> str:
+    """Pick a template from the output of _scan_keywords."""
+    data_score = sum(1 for kw in found if _KEYWORD_KIND[kw] == "data")
+    milestone_score = sum(1 for kw in found if _KEYWORD_KIND[kw] == "milestone")
 
     if data_score >= 3:
         return "data_drop"
@@ -123,10 +192,24 @@ def classify_template(draft_text: str) -> str:
         return "thought_leader"
 
 
+def classify_template(draft_text: str) -> str:
+    """
+    Auto-classify which Z5 template to use based on post content.
+
+    Returns: 'data_drop', 'thought_leader', or 'milestone'
+    """
+    return _classify_keywords(_scan_keywords(draft_text))
+
+
+@functools.lru_cache(maxsize=1024)
 def extract_headline(draft_text: str, max_words: int = 8) -> str:
     """Extract a punchy headline from the draft text."""
     # Take first sentence
-    first_sentence = draft_text.split('.')[0].strip()
+    return _headline(draft_text.split('.', 1)[0].strip(), max_words)
+
+
+def _headline(first_sentence: str, max_words: int = 8) -> str:
+    """Headline from an already-extracted first sentence."""
     words = first_sentence.split()
 
     if len(words) <= max_words:
@@ -137,6 +220,24 @@ def extract_headline(draft_text: str, max_words: int = 8) -> str:
     return headline
 
 
+@dataclass(slots=True, frozen=True)
+class DraftAnalysis:
+    """What the image prompt needs from a draft, gathered in one pass."""
+    keywords: frozenset[str]  # from _scan_keywords
+    first_sentence: str
+    sentences: tuple[str, ...]  # stripped sentences longer than 20 chars
+
+
+def _analyze(draft_text: str) -> DraftAnalysis:
+    """Split the draft into sentences and scan it for keywords, once each."""
+    parts = [part.strip() for part in draft_text.split('.')]
+    return DraftAnalysis(
+        keywords=_scan_keywords(draft_text),
+        first_sentence=parts[0],
+        sentences=tuple(part for part in parts if len(part) > 20),
+    )
+
+
 def build_image_prompt(
     draft_text: str,
     template: str = "auto",
@@ -149,10 +250,22 @@ def build_image_prompt(
     Returns:
         (prompt_string, template_used)
     """
-    if template == "auto":
-        template = classify_template(draft_text)
+    prompt, template_used = _render_image_prompt(draft_text, template, platform)
+    log.info(f"Using template: {template_used}")
+    return prompt, template_used
+
 
-    log.info(f"Using template: {template}")
+# The prompt is a pure function of its inputs, so re-rendering the same
+# draft (bulk runs, per-platform variants) is a dict lookup
+@functools.lru_cache(maxsize=1024)
+def _render_image_prompt(draft_text: str, template: str, platform: str) -> tuple[str, str]:
+    """Uncached body of build_image_prompt."""
+    # One pass over the draft serves classification, headline, subtitle
+    # and source credits
+    analysis = _analyze(draft_text)
+
+    if template == "auto":
+        template = _classify_keywords(analysis.keywords)
 
     # Platform orientation
     orientations = {
@@ -163,24 +276,21 @@ def build_image_prompt(
     orientation = orientations.get(platform, "4:5 portrait")
 
     # Extract content elements
-    headline = extract_headline(draft_text)
+    headline = _headline(analysis.first_sentence)
 
     # Extract first meaningful sentence as subtitle
-    sentences = [s.strip() for s in draft_text.split('.') if len(s.strip()) > 20]
+    sentences = analysis.sentences
     subtitle = sentences[1] if len(sentences) > 1 else sentences[0] if sentences else ""
     if len(subtitle) > 80:
         subtitle = subtitle[:77] + "..."
 
     # Source extraction
-    sources = []
-    for src in ["TechCrunch", "Bloomberg", "Reuters", "The Information", "Forbes",
-                "WSJ", "Financial Times", "Crunchbase", "PitchBook"]:
-        if src.lower() in draft_text.lower():
-            sources.append(src)
+    sources = [name for key, name in _SOURCE_NAMES.items() if key in analysis.keywords]
     source_line = "Source: " + " • ".join(sources) if sources else "Source: Z5 Capital Research"
 
     if template == "data_drop":
-        prompt = TEMPLATE_DATA_DROP.format(
+        prompt = _fill(
+            _DATA_DROP_PARTS,
             orientation=orientation,
             headline=headline,
             subtitle=subtitle,
@@ -188,12 +298,14 @@ def build_image_prompt(
         )
     elif template == "thought_leader":
         # Pick the most quotable sentence
-        prompt = TEMPLATE_THOUGHT_LEADER.format(
+        prompt = _fill(
+            _THOUGHT_LEADER_PARTS,
             orientation=orientation,
             headline=headline,
         )
     elif template == "milestone":
-        prompt = TEMPLATE_MILESTONE.format(
+        prompt = _fill(
+            _MILESTONE_PARTS,
             orientation=orientation,
             tag="Z5 CAPITAL",
             headline=headline,
@@ -202,7 +314,8 @@ def build_image_prompt(
     else:
         log.warning(f"Unknown template '{template}', falling back to data_drop")
         template = "data_drop"
-        prompt = TEMPLATE_DATA_DROP.format(
+        prompt = _fill(
+            _DATA_DROP_PARTS,
             orientation=orientation,
             headline=headline,
             subtitle=subtitle,
@@ -241,8 +354,10 @@ def generate_post_image(
 
     prompt, template_used = build_image_prompt(draft_text, template, platform)
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{draft_id}_prompt.json"
+    now = datetime.now(timezone.utc)
+    # The random suffix keeps same-second calls for one draft_id (or the
+    # default "") from overwriting each other
+    filename = f"{now.strftime('%Y%m%d_%H%M%S')}_{draft_id}_{uuid.uuid4().hex[:8]}_prompt.json"
     prompt_file = output_dir / filename
 
     prompt_data = {
@@ -251,12 +366,11 @@ def generate_post_image(
         "platform": platform,
         "draft_id": draft_id,
         "headline": extract_headline(draft_text),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": now.isoformat(),
         "z5_colors": Z5_COLORS,
     }
 
-    with open(prompt_file, "w") as f:
-        json.dump(prompt_data, f, indent=2)
+    write_json(prompt_file, prompt_data)
 
     log.info(f"✅ Image prompt saved: {prompt_file}")
     log.info(f"   Template: {template_used} | Platform: {platform}")
@@ -264,6 +378,23 @@ def generate_post_image(
     return prompt_file
 
 
+def generate_post_images(
+    drafts: list[dict],
+    concurrency: int = 5,
+) -> list[Optional[Path]]:
+    """
+    Run generate_post_image over many drafts on a bounded thread pool.
+
+    Each draft is a dict of generate_post_image keyword arguments
+    (draft_text, draft_id, template, platform, output_dir). At most
+    concurrency calls are in flight; results come back in input order.
+    """
+    if not drafts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(drafts))) as pool:
+        return list(pool.map(lambda d: generate_post_image(**d), drafts))
+
+
 # ── CLI ──────────────────────────────────────────────
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -276,8 +407,7 @@ if __name__ == "__main__":
     template = sys.argv[2] if len(sys.argv) > 2 else "auto"
     platform = sys.argv[3] if len(sys.argv) > 3 else "linkedin"
 
-    with open(draft_file) as f:
-        draft = json.load(f)
+    draft = read_json(draft_file)
 
     result = generate_post_image(
         draft_text=draft["text"],
@@ -287,8 +417,7 @@ if __name__ == "__main__":
     )
 
     if result:
-        with open(result) as f:
-            data = json.load(f)
+        data = read_json(result)
         print(f"\n{'='*60}")
         print(f"Template: {data['template']}")
         print(f"Platform: {data['platform']}")
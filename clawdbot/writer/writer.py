@@ -15,17 +15,33 @@ Flow:
   5. Write approved draft to /data/drafts/ (only writable mount)
 """
 
+import copy
 import json
 import os
 import sys
 import hashlib
 import random
 import logging
-from datetime import datetime, timezone
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TypedDict
 
 import google.generativeai as genai
+from google.generativeai import caching
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from critic_cache import open_cache, cache_key
+    from _jsonio import loads, write_json
+except ImportError:  # imported as writer.writer (tests, pipeline harness)
+    from writer.critic_cache import open_cache, cache_key
+    from writer._jsonio import loads, write_json
 
 # ── Logging ──────────────────────────────────────────
 logging.basicConfig(
@@ -57,6 +73,24 @@ MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 MAX_RETRIES = 3
 MAX_DRAFT_TOKENS = 500
 
+# RAG corpora at least this large are stream-sampled (ijson) instead of
+# being parsed and cached whole; smaller ones stay in the mtime cache.
+RAG_STREAM_MIN_BYTES = int(os.getenv("RAG_STREAM_MIN_BYTES", 8 * 1024 * 1024))
+
+# Static prompt prefixes (constitution, generation instructions) are sent
+# as Gemini context caches so retries don't pay for them again. Explicit
+# caches have a minimum size (1024 tokens on 2.5 Flash, more on older
+# models), so shorter prefixes are sent inline instead. Today both are
+# well under that (CONSTITUTION ~300 tokens, GENERATION_PREFIX ~165), so
+# this path is inert until one of them grows; meanwhile they lead each
+# prompt, where Gemini's implicit prefix caching can reuse them.
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CACHE_MIN_TOKENS", "1024"))
+CONTEXT_CACHE_TTL = timedelta(seconds=int(os.getenv("GEMINI_CACHE_TTL", "3600")))
+
+# Critic verdicts are deterministic (temperature 0); set CRITIC_CACHE_PATH
+# to a writable SQLite file to reuse them across reruns
+critic_cache = open_cache(os.getenv("CRITIC_CACHE_PATH", ""))
+
 # ── Constitutional Rules ─────────────────────────────
 CONSTITUTION = """You are a content safety validator for a VC firm's social media.
 
@@ -83,36 +117,95 @@ Review this draft post and check ALL of the following rules:
 7. **No hallucinated data**: Must NOT cite specific statistics or numbers that
    weren't in the source material.
 
-Answer with EXACTLY one of:
-- "SAFE" — if the draft passes ALL checks
-- "UNSAFE: <specific reason>" — if any check fails
+Answer with EXACTLY one JSON object:
+- {"safe": true, "reason": ""} — if the draft passes ALL checks
+- {"safe": false, "reason": "<specific reason>"} — if any check fails
 
 Do NOT provide any other commentary."""
 
 
+# ── JSON Input Cache ─────────────────────────────────
+# Parsed news/RAG files keyed by path; an entry is reused while the file's
+# mtime and size are unchanged, so repeated loads skip the read and parse.
+_json_cache: dict[str, tuple[int, int, dict]] = {}
+
+
+def _load_json_cached(path: Path) -> dict:
+    """
+    Parse a JSON file, reusing the last parse if it is unchanged.
+
+    The result is the cached object itself, shared by every caller: treat
+    it as read-only. The public loaders (load_news, load_rag_examples) hand
+    out copies, so mutations by their callers never reach the cache.
+    """
+    st = os.stat(path)
+    key = str(path)
+    cached = _json_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    data = loads(Path(path).read_bytes())
+    _json_cache[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _reservoir_sample(items, n: int) -> tuple[list, int]:
+    """
+    Uniformly sample n items from an iterable in one pass (Algorithm R).
+
+    Returns the sample and the number of items seen; only the n kept
+    items are ever held in memory.
+    """
+    reservoir = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if seen <= n:
+            reservoir.append(item)
+        elif (j := random.randrange(seen)) < n:
+            reservoir[j] = item
+    return reservoir, seen
+
+
+# Corpus parse failures from either the cached or the streaming reader
+_RAG_PARSE_ERRORS = (json.JSONDecodeError, KeyError) + ((ijson.JSONError,) if ijson else ())
+
+
+def _stream_rag_examples(path: Path, n: int) -> tuple[list[dict], int]:
+    """Reservoir-sample n examples straight off disk, without loading the corpus."""
+    with open(path, "rb") as f:
+        sampled, total = _reservoir_sample(ijson.items(f, "examples.item", use_float=True), n)
+    random.shuffle(sampled)  # a short corpus comes back in file order
+    return sampled, total
+
+
 def load_rag_examples(n: int = 5) -> list[dict]:
     """
     Load curated VC writing samples from RAG corpus.
     Randomly samples N examples for diversity.
+
+    Large corpora are streamed when ijson is installed, so only the N
+    sampled examples are materialized; the rest use the parse cache.
     """
     if not RAG_PATH.exists():
         log.warning(f"RAG corpus not found at {RAG_PATH}, using empty examples.")
         return []
 
     try:
-        with open(RAG_PATH) as f:
-            corpus = json.load(f)
+        if ijson and RAG_PATH.stat().st_size >= RAG_STREAM_MIN_BYTES:
+            sampled, total = _stream_rag_examples(RAG_PATH, n)
+        else:
+            examples = _load_json_cached(RAG_PATH).get("examples", [])
+            # Copy only the sampled examples, not the whole corpus
+            sampled = copy.deepcopy(random.sample(examples, min(n, len(examples))))
+            total = len(examples)
 
-        examples = corpus.get("examples", [])
-        if not examples:
+        if not total:
             log.warning("RAG corpus is empty.")
             return []
 
-        sampled = random.sample(examples, min(n, len(examples)))
-        log.info(f"Loaded {len(sampled)} RAG examples from {len(examples)} total.")
+        log.info(f"Loaded {len(sampled)} RAG examples from {total} total.")
         return sampled
 
-    except (json.JSONDecodeError, KeyError) as e:
+    except _RAG_PARSE_ERRORS as e:
         log.error(f"Failed to parse RAG corpus: {e}")
         return []
 
@@ -123,8 +216,7 @@ def load_news() -> dict:
         log.error(f"News file not found at {NEWS_PATH}")
         raise FileNotFoundError(f"News file missing: {NEWS_PATH}")
 
-    with open(NEWS_PATH) as f:
-        news = json.load(f)
+    news = copy.deepcopy(_load_json_cached(NEWS_PATH))
 
     log.info(
         f"Loaded news: {news.get('article_count', 0)} articles, "
@@ -133,22 +225,13 @@ def load_news() -> dict:
     return news
 
 
-def build_generation_prompt(news: dict, examples: list[dict]) -> str:
-    """Build the generation prompt with news context and style examples."""
-    examples_text = "\n".join(
-        [f"- {ex['text']}" for ex in examples]
-    ) if examples else "- [No examples available — use professional VC tone]"
-
-    return f"""You are a VC associate at Z5 Capital writing a LinkedIn post.
-
-TODAY'S NEWS:
-{news.get('summary', 'No news summary available.')}
-
-STYLE EXAMPLES (mimic this tone and approach):
-{examples_text}
+# Role and instructions: identical on every run, so this is the part of
+# the generation prompt that is served from the context cache
+GENERATION_PREFIX = """You are a VC associate at Z5 Capital writing a LinkedIn post.
 
 INSTRUCTIONS:
-Write a 150-word LinkedIn post analyzing a trend from today's news. Guidelines:
+Write a 150-word LinkedIn post analyzing a trend from today's news (below),
+in the tone of the style examples (below). Guidelines:
 - Be insightful but not preachy
 - Be data-driven (cite the news source when referencing facts)
 - Be optimistic about technology
@@ -160,18 +243,195 @@ Write a 150-word LinkedIn post analyzing a trend from today's news. Guidelines:
 Output ONLY the post text. No preamble, no "Here's a draft:", nothing except the post itself."""
 
 
-def _call_gemini(prompt: str, temperature: float = 0.7, max_tokens: int = 500) -> str:
-    """Call Gemini API and return the response text."""
-    model = genai.GenerativeModel(MODEL)
-    generation_config = genai.types.GenerationConfig(
+def build_examples_prompt(examples: list[dict]) -> str:
+    """The style examples; they are sampled per run, so they travel with the news."""
+    examples_text = "\n".join(
+        [f"- {ex['text']}" for ex in examples]
+    ) if examples else "- [No examples available — use professional VC tone]"
+
+    return f"""STYLE EXAMPLES (mimic this tone and approach):
+{examples_text}"""
+
+
+def build_news_prompt(news: dict) -> str:
+    """The per-run part of the generation prompt: today's news."""
+    return f"""TODAY'S NEWS:
+{news.get('summary', 'No news summary available.')}"""
+
+
+def build_generation_prompt(news: dict, examples: list[dict]) -> str:
+    """Build the generation prompt with news context and style examples."""
+    return f"{GENERATION_PREFIX}\n\n{build_examples_prompt(examples)}\n\n{build_news_prompt(news)}"
+
+
+# ── Gemini Client ────────────────────────────────────
+# Models and generation configs hold no per-request state, so one of each
+# is built and reused instead of constructing them on every call
+_model = genai.GenerativeModel(MODEL)
+
+# system prompt → model bound to its context cache, or None once creating
+# the cache was skipped or failed. Only static prompts (the constitution,
+# GENERATION_PREFIX) are passed in, so this holds a couple of entries.
+_cached_models: dict[str, Optional[genai.GenerativeModel]] = {}
+
+# Set once MODEL refuses a cache (e.g. no explicit caching support), so
+# later prompts skip the doomed create call
+_context_cache_disabled = False
+
+
+def _context_model(system_prompt: str) -> Optional[genai.GenerativeModel]:
+    """Return a model serving system_prompt from a context cache, creating it on first use."""
+    global _context_cache_disabled
+    if _context_cache_disabled:
+        return None
+    if system_prompt in _cached_models:
+        return _cached_models[system_prompt]
+
+    model = None
+    # ~4 characters per token; too-small prefixes would be rejected anyway
+    if len(system_prompt) // 4 >= CONTEXT_CACHE_MIN_TOKENS:
+        try:
+            cache = caching.CachedContent.create(
+                model=MODEL,
+                system_instruction=system_prompt,
+                ttl=CONTEXT_CACHE_TTL,
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache)
+            log.info(f"Created context cache {cache.name}")
+        except Exception as e:
+            log.warning(f"Context caching disabled for {MODEL}, sending prompts inline: {e}")
+            _context_cache_disabled = True
+
+    _cached_models[system_prompt] = model
+    return model
+
+
+@functools.lru_cache(maxsize=None)
+def _generation_config(temperature: float, max_tokens: int, **config):
+    """Shared GenerationConfig for one combination of settings."""
+    return genai.types.GenerationConfig(
         temperature=temperature,
         max_output_tokens=max_tokens,
+        **config,
     )
-    response = model.generate_content(
+
+
+def _gemini_response(
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str] = None,
+    **config,
+):
+    """
+    Send one generate_content request and return the raw response.
+
+    A system_prompt is served from a context cache when one can be created;
+    otherwise it is prepended to the prompt, exactly as if sent together.
+    Extra keyword arguments go into the GenerationConfig.
+    """
+    model = _context_model(system_prompt) if system_prompt else None
+    if model is None:
+        model = _model
+        if system_prompt:
+            prompt = f"{system_prompt}\n\n{prompt}"
+    return model.generate_content(
         prompt,
-        generation_config=generation_config,
+        generation_config=_generation_config(temperature, max_tokens, **config),
     )
-    return response.text.strip()
+
+
+def _call_gemini(
+    prompt: str,
+    temperature: float = 0.7,
+    max_tokens: int = 500,
+    system_prompt: Optional[str] = None,
+) -> str:
+    """Call Gemini API and return the response text."""
+    return _gemini_response(prompt, temperature, max_tokens, system_prompt).text.strip()
+
+
+def _call_gemini_candidates(
+    prompt: str,
+    n: int,
+    temperature: float = 0.7,
+    max_tokens: int = 500,
+    system_prompt: Optional[str] = None,
+) -> list[str]:
+    """
+    Ask Gemini for up to n alternative completions in a single request.
+
+    Candidates without text (e.g. blocked by safety filters) are dropped.
+    Models that reject candidate_count > 1 fall back to one completion.
+    """
+    if n > 1:
+        try:
+            response = _gemini_response(
+                prompt, temperature, max_tokens, system_prompt, candidate_count=n
+            )
+            texts = [
+                "".join(part.text for part in c.content.parts).strip()
+                for c in response.candidates
+                if c.content.parts
+            ]
+            if texts:
+                return texts
+        except Exception as e:
+            log.warning(f"Multi-candidate request failed ({e}), requesting one draft")
+    return [_call_gemini(prompt, temperature, max_tokens, system_prompt)]
+
+
+class CriticVerdict(TypedDict):
+    safe: bool
+    reason: str
+
+
+def _verdict(result) -> Optional[tuple[bool, str]]:
+    """(is_safe, reason) from one decoded CriticVerdict, or None if malformed."""
+    if not isinstance(result, dict) or not isinstance(result.get("safe"), bool):
+        return None
+    if result["safe"]:
+        return True, "Passed all constitutional checks"
+    return False, result.get("reason") or "Rejected by critic"
+
+
+def _parse_critic_reply(result: str) -> Optional[tuple[bool, str]]:
+    """
+    Decode a critic reply. Structured output makes it a CriticVerdict
+    object; a bare SAFE / UNSAFE: <reason> line (models or mocks without
+    JSON mode) is still understood. Anything else returns None.
+    """
+    try:
+        return _verdict(loads(result))
+    except ValueError:
+        pass
+
+    if result.upper().startswith("SAFE"):
+        return True, "Passed all constitutional checks"
+    if result.upper().startswith("UNSAFE"):
+        return False, result.split(":", 1)[1].strip() if ":" in result else result
+    return None
+
+
+# Fixed text between the constitution (system prompt / context cache) and
+# the draft under review
+_CRITIC_DRAFT_HEADER = "---\n\nDRAFT TO REVIEW:\n"
+
+# Batched counterpart: how the numbered drafts are introduced
+_CRITIC_BATCH_HEADER = (
+    "---\n\nReview each of the {n} numbered drafts below independently. "
+    "Instead of a single object, answer with a JSON array holding one "
+    "verdict object per draft, in order.\n\n"
+)
+
+
+def _critic_key(header: str, draft_text: str) -> str:
+    """
+    Verdict cache key for one draft. The prompt variant (single or batched
+    header) is part of the key, so verdicts from one path are never served
+    as if the other had produced them.
+    """
+    return cache_key(CONSTITUTION, header, MODEL, draft_text)
 
 
 def critic_pass(draft_text: str) -> tuple[bool, str]:
@@ -182,19 +442,24 @@ def critic_pass(draft_text: str) -> tuple[bool, str]:
     Returns:
         (is_safe: bool, reason: str)
     """
+    if critic_cache:
+        key = _critic_key(_CRITIC_DRAFT_HEADER, draft_text)
+        cached = critic_cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1]
+
     try:
-        result = _call_gemini(
-            f"{CONSTITUTION}\n\n---\n\nDRAFT TO REVIEW:\n{draft_text}",
+        result = _gemini_response(
+            _CRITIC_DRAFT_HEADER + draft_text,
             temperature=0,  # Deterministic for safety checks
             max_tokens=150,
-        )
+            system_prompt=CONSTITUTION,
+            response_mime_type="application/json",
+            response_schema=CriticVerdict,
+        ).text.strip()
 
-        if result.upper().startswith("SAFE"):
-            return True, "Passed all constitutional checks"
-        elif result.upper().startswith("UNSAFE"):
-            reason = result.split(":", 1)[1].strip() if ":" in result else result
-            return False, reason
-        else:
+        verdict = _parse_critic_reply(result)
+        if verdict is None:
             # Unexpected response — treat as unsafe
             log.warning(f"Unexpected critic response: {result[:100]}")
             return False, f"Critic gave ambiguous response: {result[:100]}"
@@ -203,6 +468,63 @@ def critic_pass(draft_text: str) -> tuple[bool, str]:
         log.error(f"Critic pass failed: {e}")
         return False, f"Critic error: {str(e)}"
 
+    # Only definitive verdicts are cached; errors and ambiguous replies are
+    # retried next time
+    if critic_cache:
+        critic_cache.set(key, verdict)
+    return verdict
+
+
+def critic_pass_batch(drafts: list[str]) -> list[tuple[bool, str]]:
+    """
+    Validate several drafts against the constitution in one Gemini call.
+
+    The critic answers with a JSON array of CriticVerdict objects (one per
+    draft) under a response schema. Cached batch verdicts are reused; a
+    single remaining draft, or a reply that can't be matched to the drafts
+    in full, goes through critic_pass one draft at a time.
+
+    Returns:
+        One (is_safe, reason) tuple per draft, in input order.
+    """
+    verdicts: list[Optional[tuple[bool, str]]] = [None] * len(drafts)
+    if critic_cache:
+        for i, draft in enumerate(drafts):
+            cached = critic_cache.get(_critic_key(_CRITIC_BATCH_HEADER, draft))
+            if cached is not None:
+                verdicts[i] = (cached[0], cached[1])
+    misses = [i for i, v in enumerate(verdicts) if v is None]
+
+    if len(misses) > 1:
+        listing = "\n\n".join(
+            f"DRAFT {n}:\n{drafts[i]}" for n, i in enumerate(misses, 1)
+        )
+        try:
+            response = _gemini_response(
+                _CRITIC_BATCH_HEADER.format(n=len(misses)) + listing,
+                temperature=0,  # Deterministic for safety checks
+                max_tokens=150 * len(misses),
+                system_prompt=CONSTITUTION,
+                response_mime_type="application/json",
+                response_schema=list[CriticVerdict],
+            )
+            results = loads(response.text)
+            if not isinstance(results, list) or len(results) != len(misses):
+                raise ValueError(f"expected a list of {len(misses)} verdicts")
+            decoded = [_verdict(result) for result in results]
+            if None in decoded:
+                bad = results[decoded.index(None)]
+                raise ValueError(f"malformed verdict: {bad!r:.100}")
+            # All or nothing: a partly malformed reply is not trusted at all
+            for i, verdict in zip(misses, decoded):
+                verdicts[i] = verdict
+                if critic_cache:
+                    critic_cache.set(_critic_key(_CRITIC_BATCH_HEADER, drafts[i]), verdict)
+        except Exception as e:
+            log.warning(f"Batched critic pass failed ({e}), checking drafts one by one")
+
+    return [v if v is not None else critic_pass(d) for v, d in zip(verdicts, drafts)]
+
 
 def generate_post() -> Optional[Path]:
     """
@@ -210,38 +532,65 @@ def generate_post() -> Optional[Path]:
 
     Flow:
         1. Load news + RAG examples
-        2. Generate draft via Gemini
-        3. Run constitutional critic
-        4. Retry up to MAX_RETRIES if critic rejects
+        2. Generate up to MAX_RETRIES candidate drafts in one Gemini call
+        3. Run the constitutional critic over them in one call
+        4. Keep the first SAFE draft; retry with the critic's feedback if
+           none passed, up to MAX_RETRIES drafts in total
         5. Save approved draft to /data/drafts/
 
     Returns:
         Path to saved draft file, or None if all attempts failed.
     """
-    # Load inputs
-    news = load_news()
-    examples = load_rag_examples(n=5)
-
-    # Build prompt
-    prompt = build_generation_prompt(news, examples)
-
-    for attempt in range(1, MAX_RETRIES + 1):
-        log.info(f"Generation attempt {attempt}/{MAX_RETRIES}...")
+    # Load inputs (independent files, read side by side)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        news_future = pool.submit(load_news)
+        examples_future = pool.submit(load_rag_examples, 5)
+        news = news_future.result()
+        examples = examples_future.result()
+
+    # Build prompt: the static instructions are cached; sampled examples,
+    # news and feedback vary per run
+    prompt = f"{build_examples_prompt(examples)}\n\n{build_news_prompt(news)}"
+
+    attempt = 0
+    while attempt < MAX_RETRIES:
+        # All but the last remaining attempt are requested as candidates of
+        # one call and judged by one critic call; the last is kept for a
+        # retry that sees the critic's feedback. A model that returns a
+        # single candidate degrades to the serial generate → critic loop.
+        wanted = max(1, MAX_RETRIES - attempt - 1)
+        log.info(f"Generation attempt {attempt + 1}/{MAX_RETRIES} ({wanted} candidate(s))...")
 
         try:
-            # Generate draft
-            draft = _call_gemini(prompt, temperature=0.7, max_tokens=MAX_DRAFT_TOKENS)
-            word_count = len(draft.split())
-            log.info(f"  Generated draft: {word_count} words")
+            # Generate drafts
+            drafts = _call_gemini_candidates(
+                prompt,
+                wanted,
+                temperature=0.7,
+                max_tokens=MAX_DRAFT_TOKENS,
+                system_prompt=GENERATION_PREFIX,
+            )[:wanted]
 
             # Constitutional critic validation
-            is_safe, reason = critic_pass(draft)
+            verdicts = critic_pass_batch(drafts)
+
+        except Exception as e:
+            attempt += 1
+            log.error(f"❌ Attempt {attempt} failed with error: {e}")
+            continue
+
+        for draft, (is_safe, reason) in zip(drafts, verdicts):
+            attempt += 1
+            word_count = len(draft.split())
+            log.info(f"  Draft {attempt}: {word_count} words")
 
             if is_safe:
                 # Save draft with metadata
-                timestamp = datetime.now(timezone.utc).isoformat()
-                draft_id = hashlib.md5(draft.encode()).hexdigest()[:8]
-                draft_filename = f"{timestamp.replace(':', '-')}_{draft_id}.json"
+                now = datetime.now(timezone.utc)
+                timestamp = now.isoformat(timespec="seconds")
+                draft_id = hashlib.blake2b(draft.encode(), digest_size=4).hexdigest()
+                # Same name isoformat() would give with ':' swapped for '-'
+                draft_filename = f"{now.strftime('%Y-%m-%dT%H-%M-%S+00-00')}_{draft_id}.json"
                 draft_file = DRAFTS_PATH / draft_filename
 
                 # Ensure directory exists
@@ -261,21 +610,17 @@ def generate_post() -> Optional[Path]:
                     "rag_examples_used": len(examples),
                 }
 
-                with open(draft_file, "w") as f:
-                    json.dump(draft_data, f, indent=2)
+                # Atomic replace: the publisher never picks up a half-written draft
+                write_json(draft_file, draft_data)
 
                 log.info(f"✅ Draft saved: {draft_file}")
                 log.info(f"   Status: pending_approval")
                 return draft_file
 
-            else:
-                log.warning(f"⚠️  Attempt {attempt} rejected by critic: {reason}")
+            log.warning(f"⚠️  Attempt {attempt} rejected by critic: {reason}")
 
-                # Append feedback to prompt for retry
-                prompt += f"\n\n[PREVIOUS DRAFT WAS REJECTED: {reason}. Please fix this issue.]"
-
-        except Exception as e:
-            log.error(f"❌ Attempt {attempt} failed with error: {e}")
+            # Append feedback to prompt for retry
+            prompt += f"\n\n[PREVIOUS DRAFT WAS REJECTED: {reason}. Please fix this issue.]"
 
     log.error(f"❌ Failed to generate safe draft after {MAX_RETRIES} attempts.")
     return None